@@ -0,0 +1,264 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from testttyyy import JSON_BACKENDS, JSONFileMerger
+
+LAYOUTS = ("many_small", "few_huge")
+STAGES = ("read", "process", "dedup", "sort", "write", "summary")
+
+FIRST_NAMES = ["Anna", "Bella", "Chloé", "Dana", "Eva", "Freya", "Gia", "Hana", "Iris", "Jade",
+               "Kira", "Lena", "Mía", "Nora", "Olga", "Paula", "Rosa", "Sofía", "Tara", "Zoë"]
+LAST_NAMES = ["Smith", "Lopez", "Müller", "Rossi", "Nowak", "Silva", "Kim", "Novak", "Berg", "Costa"]
+CATEGORIES = ["onlyfans", "instagram", "model", "actress", "tiktok"]
+TAGS = ["blonde", "brunette", "redhead", "tattoos", "fitness", "cosplay", "petite", "tall", "curvy", "gamer"]
+SITES = ["onlyfans.com", "instagram.com", "twitter.com", "fansly.com", "tiktok.com"]
+
+def make_item(rng, index, duplicate_rate):
+    """Build one synthetic actress record shaped like the scraper output"""
+    # Reuse an earlier slug now and then so dedup has work to do
+    if index and rng.random() < duplicate_rate:
+        index = rng.randrange(index)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}"
+    slug = f"actress-{index}"
+    created = datetime(2020, 1, 1) + timedelta(seconds=rng.randrange(5 * 365 * 24 * 3600))
+
+    gallery = []
+    for photo in range(rng.randint(0, 40)):
+        if rng.random() < 0.2:
+            gallery.append(f"https://cdn.example.com/{slug}/{photo}.jpg")
+        else:
+            gallery.append(f"{photo:03d}.jpg")
+
+    item = {
+        "slug": slug,
+        "name": name,
+        "category": rng.choice(CATEGORIES),
+        "gallery": gallery,
+        "websites": [{"name": site, "url": f"https://{site}/{slug}"} for site in rng.sample(SITES, rng.randint(0, 3))],
+        "tags": rng.sample(TAGS, rng.randint(0, 4)),
+        "createdAt": created.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+    }
+    if rng.random() < 0.5:
+        item["views"] = rng.randint(0, 100000)
+        item["lastViewed"] = (created + timedelta(days=rng.randint(0, 300))).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    if rng.random() < 0.3:
+        item["thumb"] = f"https://cdn.example.com/{slug}/thumb.jpg"
+    return item
+
+def generate_corpus(directory, item_count, layout="many_small", seed=0, duplicate_rate=0.05):
+    """Write a synthetic corpus of item_count items into directory and return the file list.
+
+    many_small spreads items over lots of files holding one to a few items,
+    a third of them as single objects; few_huge writes four large arrays.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    files = []
+
+    if layout == "few_huge":
+        file_count = min(4, item_count) or 1
+        sizes = [item_count // file_count + (1 if i < item_count % file_count else 0) for i in range(file_count)]
+    elif layout == "many_small":
+        sizes = []
+        remaining = item_count
+        while remaining > 0:
+            size = min(remaining, rng.choice((1, 1, 1, 2, 3, 5)))
+            sizes.append(size)
+            remaining -= size
+    else:
+        raise ValueError(f"Unknown layout: {layout}")
+
+    index = 0
+    for file_number, size in enumerate(sizes):
+        items = [make_item(rng, index + offset, duplicate_rate) for offset in range(size)]
+        index += size
+        extension = ".json" if file_number % 2 == 0 else ".txt"
+        filepath = os.path.join(directory, f"{layout}-{file_number:06d}{extension}")
+        with open(filepath, 'w', encoding='utf-8') as file:
+            if size == 1 and file_number % 3 == 0:
+                json.dump(items[0], file, ensure_ascii=False, indent=2)
+            else:
+                json.dump(items, file, ensure_ascii=False, indent=2)
+        files.append(filepath)
+
+    return files
+
+def run_stage(name, function, trace_memory):
+    """Run one stage, returning (result, stats) with wall time, CPU time and traced peak memory"""
+    if trace_memory:
+        tracemalloc.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = function()
+    stats = {
+        "seconds": time.perf_counter() - wall_start,
+        "cpu_seconds": time.process_time() - cpu_start,
+    }
+    if trace_memory:
+        stats["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, stats
+
+def available_backends():
+    backends = ["json"]
+    try:
+        import orjson  # noqa: F401
+        backends.append("orjson")
+    except ImportError:
+        pass
+    return backends
+
+def benchmark_corpus(files, output_file, trace_memory=False, output_format="pretty", backend="json"):
+    """Time each JSONFileMerger stage separately over files, mirroring merge_files"""
+    merger = JSONFileMerger(backend)
+    image_base_path = "images/actresses"
+    input_bytes = sum(os.path.getsize(filepath) for filepath in files)
+    stages = {}
+
+    # Reading and processing are interleaved per item, so their split comes from the merger's own report
+    merger.begin_run(files)
+    items, input_stats = run_stage(
+        "input", lambda: list(merger.iter_merge_input(files, image_base_path, True)), trace_memory)
+    for stage in ("read", "process"):
+        timing = merger.report.stages.get(stage, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "items": 0})
+        stages[stage] = {"seconds": timing["wall_seconds"], "cpu_seconds": timing["cpu_seconds"],
+                         "items": timing["items"], "bytes": input_bytes}
+    if trace_memory:
+        # One peak covers both stages
+        stages["read"]["peak_bytes"] = stages["process"]["peak_bytes"] = input_stats["peak_bytes"]
+
+    unique_items, stages["dedup"] = run_stage("dedup", lambda: merger.dedup_items(items), trace_memory)
+    stages["dedup"]["items"] = len(items)
+
+    merger.merged_data = unique_items
+    _, stages["sort"] = run_stage("sort", lambda: merger.sort_items(merger.merged_data), trace_memory)
+    stages["sort"]["items"] = len(merger.merged_data)
+
+    _, stages["write"] = run_stage(
+        "write", lambda: merger.write_library(merger.track_merged(merger.merged_data), output_file, output_format),
+        trace_memory)
+    stages["write"]["items"] = len(merger.merged_data)
+    stages["write"]["bytes"] = os.path.getsize(output_file)
+
+    _, stages["summary"] = run_stage("summary", merger.get_merge_summary, trace_memory)
+    stages["summary"]["items"] = len(merger.merged_data)
+
+    for stats in stages.values():
+        seconds = stats["seconds"] or 1e-9
+        stats["items_per_second"] = stats["items"] / seconds
+        if "bytes" in stats:
+            stats["mb_per_second"] = stats["bytes"] / (1024 * 1024) / seconds
+
+    return {"files": len(files), "input_bytes": input_bytes, "merged_items": len(merger.merged_data), "stages": stages}
+
+def run_benchmark(files, output_file, trace_memory, output_format, backend):
+    """Benchmark one corpus in a fresh process and add that process's peak RSS to the result"""
+    # Keep the merger's per-file print() noise out of the report
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            result = benchmark_corpus(files, output_file, trace_memory, output_format, backend)
+        finally:
+            sys.stdout = stdout
+    result["peak_rss_bytes"] = peak_rss_bytes()
+    return result
+
+def peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def print_result(result):
+    print(f"\n=== {result['layout']} [{result['backend']}]: {result['items']:,} items in {result['files']:,} files "
+          f"({result['input_bytes'] / (1024 * 1024):.1f} MB) ===")
+    if result["peak_rss_bytes"] is not None:
+        print(f"peak RSS: {result['peak_rss_bytes'] / (1024 * 1024):.1f} MB")
+    print(f"{'stage':<10}{'seconds':>10}{'cpu':>10}{'items/s':>14}{'MB/s':>10}{'peak MB':>10}")
+    for stage in STAGES:
+        stats = result["stages"][stage]
+        mb_per_second = f"{stats['mb_per_second']:.1f}" if "mb_per_second" in stats else "-"
+        peak = f"{stats['peak_bytes'] / (1024 * 1024):.1f}" if "peak_bytes" in stats else "-"
+        print(f"{stage:<10}{stats['seconds']:>10.3f}{stats['cpu_seconds']:>10.3f}"
+              f"{stats['items_per_second']:>14,.0f}{mb_per_second:>10}{peak:>10}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark JSONFileMerger stages on synthetic corpora")
+    parser.add_argument("--sizes", default="1000,10000,50000",
+                        help="comma-separated corpus sizes in items (default: 1000,10000,50000)")
+    parser.add_argument("--layouts", default=",".join(LAYOUTS),
+                        help=f"comma-separated corpus layouts (default: {','.join(LAYOUTS)})")
+    parser.add_argument("--backends", default=",".join(available_backends()),
+                        help="comma-separated JSON backends to compare (default: all installed)")
+    parser.add_argument("--format", dest="output_format", choices=JSONFileMerger.OUTPUT_FORMATS, default="pretty")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="record per-stage peak memory with tracemalloc (slows every stage down)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="directory for generated corpora (default: a temp directory)")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="machine-readable results file")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    layouts = [layout.strip() for layout in args.layouts.split(",") if layout.strip()]
+    for layout in layouts:
+        if layout not in LAYOUTS:
+            parser.error(f"unknown layout: {layout}")
+    backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+    for backend in backends:
+        if backend not in JSON_BACKENDS or backend == "auto":
+            parser.error(f"unknown JSON backend: {backend}")
+        if backend not in available_backends():
+            parser.error(f"JSON backend {backend} is not installed")
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="merger-bench-")
+    results = []
+    try:
+        for layout in layouts:
+            for size in sizes:
+                corpus_dir = os.path.join(workdir, f"{layout}-{size}")
+                shutil.rmtree(corpus_dir, ignore_errors=True)
+                print(f"Generating {layout} corpus with {size:,} items...")
+                files = generate_corpus(corpus_dir, size, layout, args.seed)
+
+                for backend in backends:
+                    # A fresh process per run, so peak RSS belongs to this corpus and backend alone
+                    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                        result = pool.submit(run_benchmark, files, os.path.join(workdir, "merged_output.txt"),
+                                             args.trace_memory, args.output_format, backend).result()
+
+                    result.update({"layout": layout, "items": size, "backend": backend})
+                    results.append(result)
+                    print_result(result)
+                shutil.rmtree(corpus_dir, ignore_errors=True)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "output_format": args.output_format,
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"\n✓ Results written to: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import json
+import random
+import struct
+
+import pytest
+
+from testttyyy import ActressRecord, GalleryPaths, JSONCodec, OrjsonCodec
+
+pytest.importorskip("orjson")
+
+EDGE_FLOATS = [0.0, -0.0, 0.1, 1.5, 1e-05, 2.5e-07, 1e-300, 5e-324, 1e15, 1e16, 1e22, 1.5e300,
+               123456789.123, 1.7976931348623157e308, 1000000000000000.0]
+BIG_INTS = [2 ** 63 - 1, 2 ** 63, 2 ** 64 - 1, 2 ** 64, -2 ** 63, -2 ** 63 - 1, 10 ** 30, -10 ** 30]
+
+def random_floats(count, seed=0):
+    rng = random.Random(seed)
+    floats = []
+    while len(floats) < count:
+        # Random bit patterns cover every exponent; NaN/Infinity aren't valid JSON here
+        value = struct.unpack("<d", rng.getrandbits(64).to_bytes(8, "little"))[0]
+        if value == value and abs(value) != float("inf"):
+            floats.append(value)
+    floats.extend(rng.uniform(-1e6, 1e6) for _ in range(count))
+    return floats
+
+@pytest.fixture(scope="module")
+def codecs():
+    return JSONCodec(), OrjsonCodec()
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_dumps_matches_stdlib(codecs, pretty):
+    stdlib, fast = codecs
+    values = EDGE_FLOATS + random_floats(2000) + BIG_INTS
+    for value in values:
+        document = {"value": value, "items": [value, {"nested": value}], "name": "Zoë"}
+        assert fast.dumps(document, pretty) == stdlib.dumps(document, pretty), value
+
+@pytest.mark.parametrize("value", EDGE_FLOATS + BIG_INTS)
+def test_loads_matches_stdlib(codecs, value):
+    stdlib, fast = codecs
+    text = json.dumps({"value": value, "items": [value, -value]})
+    for data in (text, text.encode("utf-8")):
+        decoded = fast.loads(data)
+        assert decoded == stdlib.loads(data)
+        assert type(decoded["value"]) is type(value)
+
+def test_loads_random_floats_round_trip(codecs):
+    stdlib, fast = codecs
+    values = random_floats(2000, seed=1)
+    data = json.dumps(values).encode("utf-8")
+    assert fast.loads(data) == stdlib.loads(data) == values
+
+def test_float_free_items_skip_the_stdlib(codecs, monkeypatch):
+    stdlib, fast = codecs
+    item = {"slug": "zoe", "name": "Zoë", "views": 12345, "thumb": None, "tags": ["a", "b"],
+            "createdAt": "2024-03-01T12:56.000Z", "lastViewed": "2024-03-02T08:00:00.000Z",
+            "websites": [{"name": "site", "url": "https://site/zoe"}],
+            "gallery": GalleryPaths("images/actresses", "zoe", ["001.jpg", "https://cdn/002.jpg"])}
+    expected = {pretty: stdlib.dumps(item, pretty) for pretty in (False, True)}
+
+    def fail(self, value, pretty=False):
+        raise AssertionError("encoded by the stdlib")
+    monkeypatch.setattr(JSONCodec, "dumps", fail)
+    for pretty in (False, True):
+        assert fast.dumps(item, pretty) == expected[pretty]
+        assert fast.dumps(ActressRecord(item), pretty) == expected[pretty]
+
+def test_floats_fall_back_to_the_stdlib(codecs):
+    stdlib, fast = codecs
+    for value in (1e-05, float("nan"), float("inf")):
+        item = {"slug": "zoe", "stats": [{"score": value}]}
+        assert fast.dumps(item) == stdlib.dumps(item)
@@ -0,0 +1,89 @@
+import json
+import random
+
+import pytest
+
+from testttyyy import JSONFileMerger
+
+BACKENDS = ["json"]
+try:
+    import orjson  # noqa: F401
+    BACKENDS.append("orjson")
+except ImportError:
+    pass
+
+CHUNK_SIZES = [1, 2, 3, 7, 64]
+
+@pytest.fixture(params=[(backend, chunk) for backend in BACKENDS for chunk in CHUNK_SIZES],
+                ids=lambda param: f"{param[0]}-chunk{param[1]}")
+def merger(request):
+    backend, chunk = request.param
+    merger = JSONFileMerger(backend)
+    # Force the streaming reader with tiny chunks, so every token can land on a buffer edge
+    merger.WHOLE_FILE_LIMIT = 0
+    merger.READ_CHUNK_SIZE = chunk
+    return merger
+
+def read(merger, tmp_path, data, name="input.json"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return list(merger.read_json_file(str(path))), str(path)
+
+def test_strings_crossing_chunk_boundaries(merger, tmp_path):
+    items = [
+        {"slug": "a", "bio": 'quotes \\" and "brackets" ], } { [ , inside a string'},
+        {"slug": "b", "bio": "\\\\", "path": "C:\\\\dir\\\\"},
+        {"slug": "c", "bio": "x" * 200, "escaped": "\\u00e9\\n\\t"},
+    ]
+    data = json.dumps(items).encode("utf-8")
+    result, _ = read(merger, tmp_path, data)
+    assert result == json.loads(data)
+
+def test_multibyte_utf8_split_at_buffer_edge(merger, tmp_path):
+    items = [{"name": "Zoë 日本語 🎉" * (i + 1), "tags": ["ü", "ß", "€"]} for i in range(5)]
+    data = json.dumps(items, ensure_ascii=False).encode("utf-8")
+    result, _ = read(merger, tmp_path, data)
+    assert result == items
+
+def test_numbers_at_buffer_edge(merger, tmp_path):
+    data = b"[1.5e3, 12345678, -0.25, 1E-7, 18446744073709551616, true, null, false]"
+    result, _ = read(merger, tmp_path, data)
+    assert result == json.loads(data)
+
+def test_malformed_element_reports_offset_and_is_skipped(merger, tmp_path, capsys):
+    good = [{"slug": f"item-{i}", "gallery": [f"{n:03d}.jpg" for n in range(5)]} for i in range(50)]
+    head = json.dumps(good[:25])[:-1].encode("utf-8")
+    bad = b'{"slug": "broken", "views": oops}'
+    tail = json.dumps(good[25:])[1:].encode("utf-8")
+    data = head + b", " + bad + b", " + tail
+    result, path = read(merger, tmp_path, data)
+
+    assert result == good
+    assert f"Error parsing {path} at byte {data.index(bad)}:" in capsys.readouterr().out
+
+def test_single_object(merger, tmp_path):
+    data = b'  {"slug": "solo", "gallery": ["a.jpg", "b.jpg"], "nested": {"x": [1, {"y": "]"}]}}\n'
+    result, _ = read(merger, tmp_path, data)
+    assert result == [json.loads(data)]
+
+def test_byte_order_mark(merger, tmp_path):
+    items = [{"slug": "bom", "name": "Chloé"}]
+    data = b"\xef\xbb\xbf" + json.dumps(items, ensure_ascii=False).encode("utf-8")
+    result, _ = read(merger, tmp_path, data)
+    assert result == items
+
+def test_empty_and_unterminated_arrays(merger, tmp_path, capsys):
+    assert read(merger, tmp_path, b" [ ] ")[0] == []
+    result, path = read(merger, tmp_path, b'[{"slug": "a"}, {"slug": "b"}', "cut.json")
+    assert result == [{"slug": "a"}, {"slug": "b"}]
+    assert f"Unterminated JSON array in {path}" in capsys.readouterr().out
+
+def test_streaming_matches_whole_file_decode(merger, tmp_path):
+    rng = random.Random(0)
+    items = [{"slug": f"s-{i}", "views": rng.randint(0, 10 ** 6), "score": rng.random(),
+              "name": "".join(rng.choice("abcé日🎉 \\\"") for _ in range(rng.randint(0, 12))),
+              "gallery": [f"{n:03d}.jpg" for n in range(rng.randint(0, 4))]}
+             for i in range(40)]
+    data = json.dumps(items, ensure_ascii=False, indent=rng.choice([None, 2])).encode("utf-8")
+    result, _ = read(merger, tmp_path, data)
+    assert result == json.loads(data)
@@ -1,11 +1,49 @@
+import bz2
+import contextlib
+import copy
+import fnmatch
+import glob
+import gzip
+import hashlib
+import io
+import heapq
 import json
+import lzma
 import os
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+import pickle
+import queue
+import re
+import sys
+import tempfile
+import time
+from collections import deque
 from datetime import datetime
 import threading
 
+# tkinter is imported by import_tkinter() only when the GUI is launched,
+# so headless command-line runs never pay for it. argparse, sqlite3, the
+# profilers and concurrent.futures are likewise imported by the code paths
+# that use them, keeping plain imports and --help fast
+tk = ttk = filedialog = messagebox = None
+
+def import_tkinter():
+    global tk, ttk, filedialog, messagebox
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox
+
 class JSONFileMergerGUI:
+    # (column id, heading, width) for the merge results list
+    RESULT_COLUMNS = (
+        ("name", "Name", 180),
+        ("slug", "Slug", 150),
+        ("category", "Category", 90),
+        ("gallery", "Gallery", 60),
+        ("websites", "Websites", 70),
+        ("views", "Views", 60),
+        ("created", "Created", 170),
+    )
+    RESULTS_PAGE_SIZE = 500
+    
     def __init__(self, root):
         self.root = root
         self.root.title("JSON File Merger - Enhanced")
@@ -15,6 +53,13 @@ class JSONFileMergerGUI:
         # Initialize merger
         self.merger = JSONFileMerger()
         self.input_files = []
+        self.result_rows = []
+        self.filtered_rows = []
+        self.results_page = 0
+        self.filter_job = None
+        self.progress_queue = queue.Queue()
+        self.cancel_event = None
+        self.merging = False
         
         self.setup_ui()
         
@@ -101,13 +146,57 @@ class JSONFileMergerGUI:
         ttk.Checkbutton(settings_frame, text="Preserve original metadata (views, dates, tags)", 
                        variable=self.preserve_meta_var).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
         
-        # Merge button
-        self.merge_button = ttk.Button(main_frame, text="Merge Files", 
+        # Parallel workers (1 = process files one at a time)
+        ttk.Label(settings_frame, text="Parallel Workers:").grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
+        
+        max_workers = os.cpu_count() or 1
+        self.workers_var = tk.IntVar(value=1)
+        ttk.Spinbox(settings_frame, from_=1, to=max_workers, textvariable=self.workers_var,
+                    width=5).grid(row=2, column=1, sticky=tk.W, padx=(10, 10), pady=(5, 0))
+        
+        # Output format
+        ttk.Label(settings_frame, text="Output Format:").grid(row=3, column=0, sticky=tk.W, pady=(5, 0))
+        
+        self.output_format_var = tk.StringVar(value="pretty")
+        ttk.Combobox(settings_frame, textvariable=self.output_format_var, values=JSONFileMerger.OUTPUT_FORMATS,
+                     state='readonly', width=10).grid(row=3, column=1, sticky=tk.W, padx=(10, 10), pady=(5, 0))
+        
+        # Sharded output (0 = one file); the output file then becomes the manifest
+        ttk.Label(settings_frame, text="Shard Size:").grid(row=4, column=0, sticky=tk.W, pady=(5, 0))
+        
+        shard_frame = ttk.Frame(settings_frame)
+        shard_frame.grid(row=4, column=1, sticky=tk.W, padx=(10, 10), pady=(5, 0))
+        self.shard_size_var = tk.IntVar(value=0)
+        ttk.Spinbox(shard_frame, from_=0, to=1000000, increment=500, textvariable=self.shard_size_var,
+                    width=8).grid(row=0, column=0, sticky=tk.W)
+        self.shard_by_category_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(shard_frame, text="One shard set per category",
+                        variable=self.shard_by_category_var).grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
+        
+        # Search/sort index for the web frontend
+        self.write_index_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="Write search and sort index (<output>.index.json)",
+                        variable=self.write_index_var).grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
+        # Image asset verification against image base path next to the output file
+        self.verify_assets_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="Verify image files exist (relative to the output folder)",
+                        variable=self.verify_assets_var).grid(row=6, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
+        # Merge and cancel buttons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=5, column=0, columnspan=3, pady=20)
+        
+        self.merge_button = ttk.Button(button_frame, text="Merge Files", 
                                       command=self.start_merge, style="Accent.TButton")
-        self.merge_button.grid(row=5, column=0, columnspan=3, pady=20)
+        self.merge_button.grid(row=0, column=0, padx=(0, 10))
+        
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel_merge)
+        self.cancel_button.grid(row=0, column=1)
+        self.cancel_button.state(['disabled'])
         
         # Progress bar
-        self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
+        self.progress = ttk.Progressbar(main_frame, mode='determinate', maximum=100)
         self.progress.grid(row=6, column=0, columnspan=3, sticky=(tk.W, tk.E))
         
         # Status label
@@ -118,11 +207,49 @@ class JSONFileMergerGUI:
         results_frame = ttk.LabelFrame(main_frame, text="Merge Results", padding="10")
         results_frame.grid(row=8, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(10, 0))
         results_frame.columnconfigure(0, weight=1)
-        results_frame.rowconfigure(0, weight=1)
+        results_frame.rowconfigure(2, weight=1)
         main_frame.rowconfigure(8, weight=1)
         
-        self.results_text = scrolledtext.ScrolledText(results_frame, height=10, wrap=tk.WORD)
-        self.results_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        # Statistics collected during the merge
+        self.summary_label = ttk.Label(results_frame, text="", justify=tk.LEFT)
+        self.summary_label.grid(row=0, column=0, columnspan=2, sticky=tk.W)
+        
+        # Search within the merged items
+        search_frame = ttk.Frame(results_frame)
+        search_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 5))
+        search_frame.columnconfigure(1, weight=1)
+        
+        ttk.Label(search_frame, text="Search:").grid(row=0, column=0, sticky=tk.W)
+        
+        self.results_search_var = tk.StringVar()
+        self.results_search_var.trace_add("write", self.schedule_results_filter)
+        ttk.Entry(search_frame, textvariable=self.results_search_var).grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(10, 0))
+        
+        # Item list - only one page of rows is ever handed to the Treeview
+        self.results_tree = ttk.Treeview(results_frame, columns=[column for column, _, _ in self.RESULT_COLUMNS],
+                                         show="headings", height=10)
+        for column, heading, width in self.RESULT_COLUMNS:
+            self.results_tree.heading(column, text=heading)
+            self.results_tree.column(column, width=width, stretch=column in ("name", "slug"))
+        self.results_tree.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        results_scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.results_tree.yview)
+        results_scrollbar.grid(row=2, column=1, sticky=(tk.N, tk.S))
+        self.results_tree.configure(yscrollcommand=results_scrollbar.set)
+        
+        # Paging controls
+        page_frame = ttk.Frame(results_frame)
+        page_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
+        page_frame.columnconfigure(1, weight=1)
+        
+        self.prev_page_button = ttk.Button(page_frame, text="◀ Prev", command=lambda: self.show_results_page(self.results_page - 1))
+        self.prev_page_button.grid(row=0, column=0)
+        
+        self.page_label = ttk.Label(page_frame, text="")
+        self.page_label.grid(row=0, column=1)
+        
+        self.next_page_button = ttk.Button(page_frame, text="Next ▶", command=lambda: self.show_results_page(self.results_page + 1))
+        self.next_page_button.grid(row=0, column=2)
         
         # Configure style for accent button
         style = ttk.Style()
@@ -134,7 +261,8 @@ class JSONFileMergerGUI:
     def add_files(self):
         files = filedialog.askopenfilenames(
             title="Select JSON/TXT files to merge",
-            filetypes=[("JSON files", "*.json"), ("Text files", "*.txt"), ("All files", "*.*")]
+            filetypes=[("JSON files", "*.json"), ("Text files", "*.txt"),
+                       ("Compressed files", "*.gz *.bz2 *.xz"), ("All files", "*.*")]
         )
         
         if files:
@@ -150,7 +278,8 @@ class JSONFileMergerGUI:
         filename = filedialog.asksaveasfilename(
             title="Choose where to save merged file",
             defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+            filetypes=[("Text files", "*.txt"), ("Gzip compressed", "*.gz"), ("Bzip2 compressed", "*.bz2"),
+                       ("XZ compressed", "*.xz"), ("All files", "*.*")],
             initialfile="merged_output.txt"
         )
         
@@ -208,7 +337,7 @@ class JSONFileMergerGUI:
         
         # Disable UI during merge
         self.set_ui_state(False)
-        self.progress.start()
+        self.progress['value'] = 0
         self.status_label.config(text="Merging files...")
         
         # Get settings from user input
@@ -218,39 +347,109 @@ class JSONFileMergerGUI:
         
         preserve_metadata = self.preserve_meta_var.get()
         
+        try:
+            workers = max(1, int(self.workers_var.get()))
+        except (tk.TclError, ValueError):
+            workers = 1
+        
+        output_format = self.output_format_var.get()
+        
+        try:
+            shard_size = max(0, int(self.shard_size_var.get())) or None
+        except (tk.TclError, ValueError):
+            shard_size = None
+        shard_by_category = self.shard_by_category_var.get()
+        write_index = self.write_index_var.get()
+        verify_assets = self.verify_assets_var.get()
+        
+        # Progress comes back through a queue that the Tk loop polls
+        self.progress_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.merging = True
+        self.poll_progress()
+        
         # Run merge in separate thread to prevent UI freezing
-        thread = threading.Thread(target=self.perform_merge, args=(output_file, image_base_path, preserve_metadata))
+        thread = threading.Thread(target=self.perform_merge,
+                                  args=(output_file, image_base_path, preserve_metadata, workers, output_format,
+                                        shard_size, shard_by_category, write_index, verify_assets))
         thread.daemon = True
         thread.start()
     
-    def perform_merge(self, output_file, image_base_path, preserve_metadata):
+    def cancel_merge(self):
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.cancel_button.state(['disabled'])
+            self.status_label.config(text="Cancelling...")
+    
+    def poll_progress(self):
+        latest = None
+        try:
+            while True:
+                latest = self.progress_queue.get_nowait()
+        except queue.Empty:
+            pass
+        
+        if latest is not None and not self.cancel_event.is_set():
+            self.progress['value'] = latest.fraction * 100
+            self.status_label.config(text=self.format_progress(latest))
+        
+        if self.merging:
+            self.root.after(100, self.poll_progress)
+    
+    def format_progress(self, progress):
+        if progress.stage != "processing":
+            return f"{progress.stage.capitalize()}... ({progress.items_written:,} items written)"
+        
+        text = (f"Files {progress.files_done}/{progress.total_files} • "
+                f"{progress.bytes_read / (1024 * 1024):.1f}/{progress.total_bytes / (1024 * 1024):.1f} MB • "
+                f"{progress.items_per_second:,.0f} items/s")
+        eta = progress.eta_seconds
+        if eta is not None:
+            minutes, seconds = divmod(int(eta), 60)
+            text += f" • ETA {minutes}:{seconds:02d}"
+        return text
+    
+    def perform_merge(self, output_file, image_base_path, preserve_metadata, workers=1, output_format="pretty",
+                      shard_size=None, shard_by_category=False, write_index=False, verify_assets=False):
         try:
-            success = self.merger.merge_files(self.input_files, output_file, image_base_path, preserve_metadata)
+            success = self.merger.merge_files(self.input_files, output_file, image_base_path, preserve_metadata,
+                                              workers, output_format=output_format,
+                                              progress_callback=self.progress_queue.put,
+                                              cancel_event=self.cancel_event, shard_size=shard_size,
+                                              shard_by_category=shard_by_category, write_index=write_index,
+                                              verify_assets=verify_assets)
+            
+            # Build the result rows here so the Tk thread only has to display them
+            rows = self.build_result_rows(self.merger.merged_data) if success else []
             
             # Update UI in main thread
-            self.root.after(0, self.merge_complete, success, output_file)
+            self.root.after(0, self.merge_complete, success, output_file, rows)
             
         except Exception as e:
             self.root.after(0, self.merge_error, str(e))
     
-    def merge_complete(self, success, output_file):
-        self.progress.stop()
+    def merge_complete(self, success, output_file, rows=()):
+        self.merging = False
         self.set_ui_state(True)
         
-        if success:
+        if self.merger.cancelled:
+            self.progress['value'] = 0
+            self.status_label.config(text="Merge cancelled - no output written")
+        elif success:
+            self.progress['value'] = 100
             self.status_label.config(text=f"Merge completed successfully!")
             
             # Display results
-            results = self.merger.get_merge_summary()
-            self.results_text.delete(1.0, tk.END)
-            self.results_text.insert(tk.END, results)
+            self.summary_label.config(text=self.merger.summary.format())
+            self.result_rows = rows
+            self.filter_results()
             
             # Show success message with file location
             messagebox.showinfo(
                 "Success", 
                 f"Files merged successfully!\n\n"
                 f"Saved to: {output_file}\n\n"
-                f"Total items merged: {len(self.merger.merged_data)}"
+                f"Total items merged: {self.merger.merged_count}"
             )
             
             # Open the containing folder
@@ -259,6 +458,56 @@ class JSONFileMergerGUI:
             self.status_label.config(text="Merge failed!")
             messagebox.showerror("Error", "Failed to merge files. Check the console for details.")
     
+    def build_result_rows(self, items):
+        """Flatten items into Treeview rows, each ending with a lowercase search key"""
+        rows = []
+        for item in items:
+            name = str(item.get('name', ''))
+            slug = str(item.get('slug', ''))
+            category = str(item.get('category', 'N/A'))
+            rows.append((
+                name, slug, category,
+                len(item.get('gallery', [])),
+                len(item.get('websites', [])),
+                item.get('views', 'N/A'),
+                item.get('createdAt', 'N/A'),
+                f"{name}\n{slug}\n{category}".lower(),
+            ))
+        return rows
+    
+    def schedule_results_filter(self, *args):
+        # Debounce so typing doesn't rescan the results on every keystroke
+        if self.filter_job is not None:
+            self.root.after_cancel(self.filter_job)
+        self.filter_job = self.root.after(200, self.filter_results)
+    
+    def filter_results(self):
+        self.filter_job = None
+        query = self.results_search_var.get().strip().lower()
+        if query:
+            self.filtered_rows = [row for row in self.result_rows if query in row[-1]]
+        else:
+            self.filtered_rows = self.result_rows
+        self.show_results_page(0)
+    
+    def show_results_page(self, page):
+        total = len(self.filtered_rows)
+        last_page = max(0, (total - 1) // self.RESULTS_PAGE_SIZE)
+        self.results_page = min(max(page, 0), last_page)
+        start = self.results_page * self.RESULTS_PAGE_SIZE
+        end = min(start + self.RESULTS_PAGE_SIZE, total)
+        
+        self.results_tree.delete(*self.results_tree.get_children())
+        for row in self.filtered_rows[start:end]:
+            self.results_tree.insert("", tk.END, values=row[:-1])
+        
+        if total:
+            self.page_label.config(text=f"Items {start + 1:,}–{end:,} of {total:,}")
+        else:
+            self.page_label.config(text="No matching items" if self.result_rows else "")
+        self.prev_page_button.state(['!disabled'] if self.results_page > 0 else ['disabled'])
+        self.next_page_button.state(['!disabled'] if self.results_page < last_page else ['disabled'])
+    
     def open_containing_folder(self, filepath):
         """Open the folder containing the merged file"""
         try:
@@ -274,7 +523,8 @@ class JSONFileMergerGUI:
             print(f"Could not open folder: {e}")
     
     def merge_error(self, error_msg):
-        self.progress.stop()
+        self.merging = False
+        self.progress['value'] = 0
         self.set_ui_state(True)
         self.status_label.config(text="Merge error!")
         messagebox.showerror("Error", f"An error occurred during merge:\n{error_msg}")
@@ -282,57 +532,1533 @@ class JSONFileMergerGUI:
     def set_ui_state(self, enabled):
         state = "normal" if enabled else "disabled"
         self.merge_button.config(state=state)
+        self.cancel_button.config(state="disabled" if enabled else "normal")
 
-class JSONFileMerger:
+class JSONCodec:
+    """JSON encode/decode backend built on the stdlib json module.
+    
+    Encoding always uses ensure_ascii=False; compact output uses (',', ':')
+    separators and pretty output matches json.dumps(indent=2). Other
+    backends must produce exactly the same text.
+    """
+    name = "json"
+    
+    def loads(self, data):
+        return json.loads(data)
+    
+    def dumps(self, value, pretty=False):
+        if pretty:
+            return json.dumps(value, indent=2, ensure_ascii=False, default=expand_compact)
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=expand_compact)
+
+class OrjsonCodec(JSONCodec):
+    """JSON backend using orjson, falling back to the stdlib for anything orjson treats differently"""
+    name = "orjson"
+    
+    # orjson decodes integers outside the 64-bit range as lossy floats; input
+    # with any run of 19+ digits (which may be one) is decoded by the stdlib.
+    # Digits are mapped to b'0' and everything else to b' ' so the check is a
+    # plain substring search, much cheaper than a regex over the whole input
+    DIGIT_MASK = bytes(0x30 if 0x30 <= byte <= 0x39 else 0x20 for byte in range(256))
+    LONG_DIGIT_RUN = b'0' * 19
+    
+    def __init__(self):
+        import orjson
+        self.orjson = orjson
+    
+    def loads(self, data):
+        raw = data.encode('utf-8') if isinstance(data, str) else bytes(data)
+        if self.LONG_DIGIT_RUN in raw.translate(self.DIGIT_MASK):
+            return json.loads(data)
+        try:
+            return self.orjson.loads(data)
+        except self.orjson.JSONDecodeError:
+            # NaN/Infinity literals and out-of-range floats are accepted by the stdlib only
+            return json.loads(data)
+    
+    # Exact types that can't hold a float; anything else (subclasses too) is checked in full
+    SCALAR_TYPES = frozenset((str, int, bool, type(None)))
+    
+    @classmethod
+    def _contains_float(cls, value):
+        """True if value holds a float anywhere; orjson writes some of them differently"""
+        if isinstance(value, float):
+            return True
+        if isinstance(value, (dict, ActressRecord)):
+            value = value.values()
+        elif not isinstance(value, (list, tuple)):
+            return False
+        scalar_types = cls.SCALAR_TYPES
+        for child in value:
+            if type(child) not in scalar_types and cls._contains_float(child):
+                return True
+        return False
+    
+    def dumps(self, value, pretty=False):
+        # orjson writes some floats differently from repr() (1e-05 as 0.00001) and
+        # NaN/Infinity as null, so values holding any float are encoded by the stdlib
+        if self._contains_float(value):
+            return super().dumps(value, pretty)
+        try:
+            encoded = self.orjson.dumps(value, default=expand_compact,
+                                        option=self.orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            return super().dumps(value, pretty)
+        return encoded.decode('utf-8')
+
+JSON_BACKENDS = ("auto", "json", "orjson")
+
+def get_codec(backend="auto"):
+    """Return the codec for backend; "auto" prefers orjson when it is installed"""
+    if isinstance(backend, JSONCodec):
+        return backend
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {backend}")
+    if backend in ("auto", "orjson"):
+        try:
+            return OrjsonCodec()
+        except ImportError:
+            if backend == "orjson":
+                raise
+    return JSONCodec()
+
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+COMPRESSION_MAGIC = ((b'\x1f\x8b', "gzip"), (b'BZh', "bz2"), (b'\xfd7zXZ\x00', "xz"))
+DEFAULT_COMPRESS_LEVELS = {"gzip": 6, "bz2": 9, "xz": 6}
+COMPRESS_LEVEL_RANGES = {"gzip": (0, 9), "bz2": (1, 9), "xz": (0, 9)}
+
+def split_compression_suffix(path):
+    """Return (path without .gz/.bz2/.xz, compression name or None)"""
+    root, suffix = os.path.splitext(path)
+    compression = COMPRESSION_SUFFIXES.get(suffix.lower())
+    return (root, compression) if compression else (path, None)
+
+def open_input(filepath):
+    """Open filepath for binary reading, decompressing gzip/bz2/xz content on the fly.
+    
+    The compression is detected from the file's magic bytes, not its name.
+    filepath may also be an open, seekable binary file: it is then read in
+    place (and returned as-is when uncompressed), so its tell() tracks how
+    much of the file on disk has been consumed.
+    """
+    is_path = isinstance(filepath, (str, bytes, os.PathLike))
+    if is_path:
+        with open(filepath, 'rb') as file:
+            magic = file.read(6)
+    else:
+        magic = filepath.read(6)
+        filepath.seek(0)
+    for prefix, compression in COMPRESSION_MAGIC:
+        if magic.startswith(prefix):
+            if compression == "gzip":
+                return gzip.open(filepath, 'rb')
+            if compression == "bz2":
+                return bz2.open(filepath, 'rb')
+            return lzma.open(filepath, 'rb')
+    return open(filepath, 'rb') if is_path else filepath
+
+def open_compressor(file, compression, level=None):
+    """Wrap the binary file object file in a compressing writer; closing it leaves file open"""
+    if level is None:
+        level = DEFAULT_COMPRESS_LEVELS.get(compression)
+    elif compression in COMPRESS_LEVEL_RANGES:
+        low, high = COMPRESS_LEVEL_RANGES[compression]
+        if not low <= level <= high:
+            raise ValueError(f"{compression} compression level must be between {low} and {high}, got {level}")
+    if compression == "gzip":
+        # mtime=0 keeps the output byte-for-byte reproducible
+        return gzip.GzipFile(fileobj=file, mode='wb', compresslevel=level, mtime=0)
+    if compression == "bz2":
+        return bz2.BZ2File(file, 'wb', compresslevel=level)
+    if compression == "xz":
+        return lzma.LZMAFile(file, 'wb', preset=level)
+    raise ValueError(f"Unknown compression: {compression}")
+
+class GalleryPaths:
+    """Gallery list stored as image_base_path + slug plus the raw entry names.
+    
+    Entries starting with "http" are URLs and are kept as-is; every other
+    entry expands to image_base_path/slug/name. Expansion only happens when
+    the gallery is iterated or written out, so the shared prefix is never
+    repeated in memory.
+    """
+    __slots__ = ("base", "slug", "names")
+    
+    def __init__(self, base, slug, names):
+        for name in names:
+            if not isinstance(name, str):
+                raise TypeError(f"Gallery entries must be strings, got {type(name).__name__}")
+        self.base = sys.intern(base)
+        self.slug = slug
+        self.names = tuple(sys.intern(name) for name in names)
+    
+    def __reduce__(self):
+        return (GalleryPaths, (self.base, self.slug, self.names))
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def __iter__(self):
+        return iter(self.expand())
+    
+    def __eq__(self, other):
+        if isinstance(other, GalleryPaths):
+            other = list(other)
+        return list(self) == other
+    
+    def __repr__(self):
+        return repr(list(self))
+    
+    def expand(self):
+        prefix = f"{self.base}/{self.slug}/"
+        return [name if name.startswith("http") else prefix + name for name in self.names]
+
+class ActressRecord:
+    """Read-only, compact stand-in for a merged item dict.
+    
+    Records with the same keys in the same order share one key layout,
+    category and tag strings are interned, and galleries are GalleryPaths.
+    Supports the dict read API (item["slug"], get, in, keys, items) and
+    expands back to the exact same dict through expand()/expand_compact.
+    """
+    __slots__ = ("_layout", "_values")
+    
+    # keys tuple -> (keys tuple, {key: index}), shared by all records with that layout
+    _layouts = {}
+    INTERNED_FIELDS = ("category",)
+    
+    def __init__(self, item):
+        keys = tuple(item)
+        layout = self._layouts.get(keys)
+        if layout is None:
+            layout = self._layouts.setdefault(keys, (keys, {key: index for index, key in enumerate(keys)}))
+        self._layout = layout
+        self._values = tuple(self._compact_value(key, value) for key, value in item.items())
+    
+    @staticmethod
+    def _compact_value(key, value):
+        if key in ActressRecord.INTERNED_FIELDS and isinstance(value, str):
+            return sys.intern(value)
+        if key == "tags" and isinstance(value, (list, tuple)):
+            return tuple(sys.intern(tag) if isinstance(tag, str) else tag for tag in value)
+        return value
+    
+    def __reduce__(self):
+        # Pickle as plain keys/values so unpickled records rejoin the shared layouts
+        return (_rebuild_record, (self._layout[0], self._values))
+    
+    def __getitem__(self, key):
+        return self._values[self._layout[1][key]]
+    
+    def get(self, key, default=None):
+        index = self._layout[1].get(key)
+        return default if index is None else self._values[index]
+    
+    def __contains__(self, key):
+        return key in self._layout[1]
+    
+    def __iter__(self):
+        return iter(self._layout[0])
+    
+    def __len__(self):
+        return len(self._values)
+    
+    def keys(self):
+        return self._layout[0]
+    
+    def values(self):
+        return self._values
+    
+    def items(self):
+        return zip(self._layout[0], self._values)
+    
+    def __eq__(self, other):
+        if isinstance(other, ActressRecord):
+            other = other.expand()
+        return self.expand() == other
+    
+    def __repr__(self):
+        return f"ActressRecord({self.expand()!r})"
+    
+    def replace(self, key, value):
+        """Return a copy of this record with key set to value (key must already exist)"""
+        values = list(self._values)
+        values[self._layout[1][key]] = value
+        return _rebuild_record(self._layout[0], values)
+    
+    def expand(self):
+        """Return the equivalent plain dict, as it will be serialized"""
+        item = {}
+        for key, value in zip(self._layout[0], self._values):
+            if isinstance(value, GalleryPaths):
+                value = value.expand()
+            elif isinstance(value, tuple):
+                value = list(value)
+            item[key] = value
+        return item
+
+def _rebuild_record(keys, values):
+    record = ActressRecord.__new__(ActressRecord)
+    layout = ActressRecord._layouts.get(keys)
+    if layout is None:
+        layout = ActressRecord._layouts.setdefault(keys, (keys, {key: index for index, key in enumerate(keys)}))
+    record._layout = layout
+    record._values = tuple(ActressRecord._compact_value(key, value) for key, value in zip(keys, values))
+    return record
+
+def _restore_record(keys, values):
+    """_rebuild_record for values that are already compact, e.g. ones from the parse cache"""
+    record = ActressRecord.__new__(ActressRecord)
+    layout = ActressRecord._layouts.get(keys)
+    if layout is None:
+        layout = ActressRecord._layouts.setdefault(keys, (keys, {key: index for index, key in enumerate(keys)}))
+    record._layout = layout
+    record._values = values
+    return record
+
+class StampedTime(str):
+    """A createdAt generated by the merge (datetime.now()) rather than read from the input.
+    
+    Behaves as the plain string everywhere; the parse cache uses the type to
+    stamp such fields afresh on every hit instead of replaying the first run's time.
+    """
+    __slots__ = ()
+    FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
+    
+    @classmethod
+    def now(cls):
+        return cls(datetime.now().strftime(cls.FORMAT))
+
+def expand_compact(value):
+    """json default hook: serialize ActressRecord and GalleryPaths as the plain values they stand for"""
+    if isinstance(value, (ActressRecord, GalleryPaths)):
+        return value.expand()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class CacheLookup:
+    """Result of checking one input file against the parse cache"""
+    def __init__(self, key, size, mtime_ns, content_hash, hit):
+        self.key = key
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.content_hash = content_hash
+        self.hit = hit
+
+class _CacheUnpickler(pickle.Unpickler):
+    """Finds this module's classes whether the cache was written by the script (__main__) or an importer"""
+    CLASSES = ("GalleryPaths", "StampedTime")
+    
+    def find_class(self, module, name):
+        if module in ("__main__", __name__) and name in self.CLASSES:
+            return globals()[name]
+        return super().find_class(module, name)
+
+class ParseCache:
+    """On-disk cache of process_file results.
+    
+    Entries are keyed by the input's absolute path plus the merge settings
+    that change process_file output, and validated against the file's size
+    and mtime. A file whose mtime changed but whose size didn't is hashed
+    and still counts as a hit if its content is unchanged; files without an
+    entry are never read twice just to be hashed.
+    
+    The records of every entry live in one pickled pack, stored as their
+    compact key layout and values, so a hit is rebuilt without decoding or
+    re-compacting anything. The pack is loaded once and only rewritten
+    when entries were added or evicted; the small index beside it carries
+    sizes, mtimes and last use. createdAt values the merge generated
+    (StampedTime) are stamped afresh on every hit. Least recently used
+    entries are evicted once the inputs they were made from add up to more
+    than max_bytes.
+    """
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+    FORMAT = 3
+    INDEX_FILENAME = "index.pickle"
+    PACK_FILENAME = "records.pickle"
+    # Files written by the earlier JSON-per-entry format, removed on sight
+    LEGACY_INDEX_FILENAME = "index.json"
+    LEGACY_DATA_FILE = re.compile(r'[0-9a-f]{64}\.json(\.tmp)?')
+    
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._remove_legacy_files()
+        self.index, self.records = self._load()
+        self.records_changed = False
+        self.total_bytes = sum(entry["bytes"] for entry in self.index.values())
+    
+    def _remove_legacy_files(self):
+        if not os.path.exists(os.path.join(self.cache_dir, self.LEGACY_INDEX_FILENAME)):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name == self.LEGACY_INDEX_FILENAME or self.LEGACY_DATA_FILE.fullmatch(name):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+    
+    def _load(self):
+        """Return (index, records); both empty if the cache is missing, stale or unreadable"""
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILENAME), 'rb') as file:
+                index = pickle.load(file)
+            if not isinstance(index, dict) or index.get("format") != self.FORMAT:
+                return {}, {}
+            with open(os.path.join(self.cache_dir, self.PACK_FILENAME), 'rb') as file:
+                records = _CacheUnpickler(file).load()
+        except FileNotFoundError:
+            return {}, {}
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable parse cache: {e}")
+            return {}, {}
+        # Entries whose records didn't make it into the pack are misses
+        entries = {key: entry for key, entry in index["entries"].items() if key in records}
+        return entries, records
+    
+    def hash_file(self, filepath):
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def lookup(self, filepath, image_base_path, preserve_metadata):
+        """Check filepath against the cache; returns a CacheLookup, or None if the file can't be read"""
+        key = json.dumps([os.path.abspath(filepath), image_base_path, bool(preserve_metadata)])
+        try:
+            stat = os.stat(filepath)
+            entry = self.index.get(key)
+            content_hash = None
+            hit = False
+            if entry and entry["size"] == stat.st_size:
+                if entry["mtime_ns"] == stat.st_mtime_ns:
+                    # Same size and mtime is trusted
+                    content_hash = entry["content_hash"]
+                    hit = True
+                else:
+                    # A touched file is confirmed by hashing it
+                    content_hash = self.hash_file(filepath)
+                    hit = entry["content_hash"] is not None and content_hash == entry["content_hash"]
+        except OSError:
+            self.misses += 1
+            return None
+        
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return CacheLookup(key, stat.st_size, stat.st_mtime_ns, content_hash, hit)
+    
+    def load(self, lookup):
+        """Return the cached items of a hit as ActressRecords, or None if the entry was evicted since"""
+        packed = self.records.get(lookup.key)
+        if packed is None:
+            self.hits -= 1
+            self.misses += 1
+            return None
+        items = []
+        stamp = None
+        for keys, values, stamped in packed:
+            if stamped is not None:
+                if stamp is None:
+                    stamp = StampedTime.now()
+                values = values[:stamped] + (stamp,) + values[stamped + 1:]
+            items.append(_restore_record(keys, values))
+        
+        entry = self.index[lookup.key]
+        entry["mtime_ns"] = lookup.mtime_ns
+        entry["last_used"] = time.time()
+        return items
+    
+    @staticmethod
+    def _pack_record(item):
+        """(keys, values, index of a StampedTime value or None) for one ActressRecord"""
+        values = item.values()
+        stamped = None
+        for index, value in enumerate(values):
+            if isinstance(value, StampedTime):
+                stamped = index
+                break
+        return item.keys(), values, stamped
+    
+    def store(self, lookup, items):
+        if lookup.hit and lookup.key in self.index:
+            return
+        previous = self.index.get(lookup.key)
+        if previous is not None:
+            self.total_bytes -= previous["bytes"]
+        self.records[lookup.key] = [self._pack_record(item) for item in items]
+        self.records_changed = True
+        self.index[lookup.key] = {
+            "size": lookup.size,
+            "mtime_ns": lookup.mtime_ns,
+            "content_hash": lookup.content_hash,
+            "bytes": lookup.size,
+            "last_used": time.time(),
+        }
+        self.total_bytes += lookup.size
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+    
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        if self.total_bytes <= self.max_bytes:
+            return
+        for key in sorted(self.index, key=lambda k: self.index[k]["last_used"]):
+            if self.total_bytes <= self.max_bytes:
+                break
+            self.total_bytes -= self.index.pop(key)["bytes"]
+            self.records.pop(key, None)
+            self.records_changed = True
+    
+    def _write(self, filename, value):
+        path = os.path.join(self.cache_dir, filename)
+        with open(path + ".tmp", 'wb') as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+    
+    def save(self):
+        try:
+            # The pack goes first: an index pointing at records that aren't there only costs misses
+            if self.records_changed:
+                self._write(self.PACK_FILENAME, self.records)
+                self.records_changed = False
+            self._write(self.INDEX_FILENAME, {"format": self.FORMAT, "entries": self.index})
+        except OSError as e:
+            print(f"Warning: Could not save parse cache: {e}")
+
+class LibraryStore:
+    """Persistent SQLite library that merged batches are upserted into.
+    
+    Each upsert bumps a revision counter and stamps the rows it touched, so
+    adding a batch costs time proportional to the batch and export can
+    write either the whole library or only what changed since last export.
+    """
+    # Fields the library keeps from the stored row when preserving metadata
+    PRESERVED_FIELDS = ("views", "lastViewed", "createdAt")
+    LOOKUP_BATCH_SIZE = 500
+    
+    def __init__(self, db_path, codec=None):
+        self.db_path = db_path
+        self.codec = codec or get_codec()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        import sqlite3
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS actresses (
+                slug TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                revision INTEGER NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS actresses_revision ON actresses (revision);
+            CREATE INDEX IF NOT EXISTS actresses_created_at ON actresses (created_at);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+    
+    def close(self):
+        self.connection.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _get_meta(self, key):
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+    
+    def _set_meta(self, key, value):
+        self.connection.execute("INSERT INTO meta (key, value) VALUES (?, ?) "
+                                "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value))
+    
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM actresses").fetchone()[0]
+    
+    def _fetch_existing(self, slugs):
+        existing = {}
+        for i in range(0, len(slugs), self.LOOKUP_BATCH_SIZE):
+            chunk = slugs[i:i + self.LOOKUP_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            for slug, data in self.connection.execute(
+                    f"SELECT slug, data FROM actresses WHERE slug IN ({placeholders})", chunk):
+                existing[slug] = self.codec.loads(data)
+        return existing
+    
+    def upsert(self, items, preserve_metadata=True):
+        """Insert or update items by slug. Returns (inserted, updated).
+        
+        Within a batch the first item for a slug wins, as in merge_files.
+        When preserving metadata, views, lastViewed and createdAt already in
+        the library are kept over the incoming values.
+        """
+        batch = {}
+        for item in items:
+            batch.setdefault(item["slug"], item)
+        if not batch:
+            return 0, 0
+        
+        existing = self._fetch_existing(list(batch))
+        with self.connection:
+            revision = self._get_meta("revision") + 1
+            self._set_meta("revision", revision)
+            
+            rows = []
+            for slug, item in batch.items():
+                stored = existing.get(slug)
+                if stored is not None and preserve_metadata:
+                    item = dict(item)
+                    for field in self.PRESERVED_FIELDS:
+                        if field in stored:
+                            item[field] = stored[field]
+                rows.append((slug, item.get("createdAt", ""), revision, self.codec.dumps(item)))
+            
+            self.connection.executemany(
+                "INSERT INTO actresses (slug, created_at, revision, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(slug) DO UPDATE SET created_at = excluded.created_at, "
+                "revision = excluded.revision, data = excluded.data", rows)
+        
+        updated = len(existing)
+        return len(batch) - updated, updated
+    
+    def iter_items(self, changes_only=False):
+        """Yield library items newest first; with changes_only, only rows changed since the last export"""
+        since = self._get_meta("exported_revision") if changes_only else 0
+        cursor = self.connection.execute(
+            "SELECT data FROM actresses WHERE revision > ? ORDER BY created_at DESC, rowid", (since,))
+        for (data,) in cursor:
+            yield self.codec.loads(data)
+    
+    def mark_exported(self):
+        with self.connection:
+            self._set_meta("exported_revision", self._get_meta("revision"))
+
+class MergeSummary:
+    """Statistics gathered from merged items as they are written out"""
     def __init__(self):
+        self.total_items = 0
+        self.categories = {}
+        self.gallery_images = 0
+        self.websites = 0
+        self.total_views = 0
+        self.newest = None
+        self.oldest = None
+    
+    def add(self, item):
+        self.total_items += 1
+        category = item.get('category', 'N/A')
+        self.categories[category] = self.categories.get(category, 0) + 1
+        self.gallery_images += len(item.get('gallery', []))
+        self.websites += len(item.get('websites', []))
+        views = item.get('views')
+        if isinstance(views, (int, float)):
+            self.total_views += views
+        created = item.get('createdAt')
+        if isinstance(created, str) and created:
+            if self.newest is None or created > self.newest:
+                self.newest = created
+            if self.oldest is None or created < self.oldest:
+                self.oldest = created
+    
+    def format(self):
+        categories = ", ".join(f"{name}: {count}" for name, count in
+                               sorted(self.categories.items(), key=lambda entry: -entry[1]))
+        return (f"Total items merged: {self.total_items}\n"
+                f"Categories: {categories or 'N/A'}\n"
+                f"Gallery images: {self.gallery_images}  Websites: {self.websites}  Views: {self.total_views}\n"
+                f"Created: {self.oldest or 'N/A'} to {self.newest or 'N/A'}")
+
+class SearchIndex:
+    """Search and sort index over merged items, built as they are written out.
+    
+    Items are referred to by their position in the output. terms is the
+    sorted list of lower-cased name, category and tag tokens, and
+    postings[i] lists the positions containing terms[i], so a prefix
+    search is a binary search for the range of terms starting with the
+    prefix. orders holds the positions pre-sorted for each of the
+    frontend's sort options.
+    """
+    VERSION = 1
+    TOKEN = re.compile(r'\w+')
+    
+    def __init__(self):
+        self.slugs = []
+        self.postings = {}
+        self.names = []
+        self.created = []
+        self.views = []
+        self.photos = []
+        self.links = []
+    
+    def add(self, item):
+        position = len(self.slugs)
+        self.slugs.append(item["slug"])
+        name = str(item.get("name", ""))
+        category = str(item.get("category", ""))
+        tags = item.get("tags") or []
+        
+        text = " ".join([name, category, *(str(tag) for tag in tags)]).lower()
+        for term in set(self.TOKEN.findall(text)):
+            self.postings.setdefault(term, []).append(position)
+        
+        views = item.get("views")
+        self.names.append(name.casefold())
+        self.created.append(str(item.get("createdAt") or ""))
+        self.views.append(views if isinstance(views, (int, float)) else 0)
+        self.photos.append(len(item.get("gallery") or []))
+        self.links.append(len(item.get("websites") or []))
+    
+    def to_dict(self):
+        positions = range(len(self.slugs))
+        terms = sorted(self.postings)
+        # sorted() is stable, so ties keep their output order in every ordering
+        return {
+            "version": self.VERSION,
+            "total": len(self.slugs),
+            "slugs": self.slugs,
+            "terms": terms,
+            "postings": [self.postings[term] for term in terms],
+            "orders": {
+                "name": sorted(positions, key=self.names.__getitem__),
+                "name-desc": sorted(positions, key=self.names.__getitem__, reverse=True),
+                "recent": sorted(positions, key=self.created.__getitem__, reverse=True),
+                "views": sorted(positions, key=self.views.__getitem__, reverse=True),
+                "photos": sorted(positions, key=self.photos.__getitem__, reverse=True),
+                "links": sorted(positions, key=self.links.__getitem__, reverse=True),
+            },
+        }
+
+class AssetVerifier:
+    """Checks the local thumb and gallery images of merged items against the files on disk.
+    
+    image_base_path is the path used inside the items and asset_root the
+    directory it maps to. Every image directory is listed once with
+    os.scandir on a thread pool and the listing is cached for the life of
+    the verifier. Only referenced files are stat()ed for their size: the
+    names known when the directory is queued inside the listing thread, any
+    others on first use.
+    
+    Items flow through verify() in order; per-item problems (missing,
+    zero-byte and extra files) are collected in self.problems. Directories
+    that exist but can't be read are recorded in self.unreadable and their
+    files are neither reported nor dropped.
+    """
+    DEFAULT_WORKERS = 32
+    LOOKAHEAD = 4096  # items queued ahead so listings are fetched concurrently
+    
+    def __init__(self, asset_root, image_base_path, workers=DEFAULT_WORKERS, drop_dead=False):
+        self.asset_root = asset_root
+        self.prefix = f"{image_base_path.rstrip('/')}/"
+        self.workers = max(1, workers)
+        self.drop_dead = drop_dead
+        # relative directory -> future of {name: size or None if not stat()ed yet},
+        # None if the directory is missing or the OSError if it couldn't be read
+        self.listings = {}
+        self.reset()
+    
+    def reset(self):
+        self.problems = []
+        self.items_checked = 0
+        self.files_checked = 0
+        self.missing = 0
+        self.zero_byte = 0
+        self.extra = 0
+        self.dropped = 0
+        self.unreadable = {}  # relative directory -> error message
+    
+    def _list_directory(self, directory, names):
+        """List directory, stat()ing only the files in names"""
+        listing = {}
+        try:
+            with os.scandir(os.path.join(self.asset_root, directory)) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        listing[entry.name] = entry.stat().st_size if entry.name in names else None
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        except OSError as e:
+            return e
+        return listing
+    
+    def _file_size(self, listing, directory, name):
+        """Size of a listed file, stat()ing it on first use; None if it is gone"""
+        size = listing.get(name)
+        if size is None and name in listing:
+            try:
+                size = os.stat(os.path.join(self.asset_root, directory, name)).st_size
+            except OSError:
+                return None
+            listing[name] = size
+        return size
+    
+    def _references(self, item):
+        """(directory, name, kind) for each local image of item under image_base_path"""
+        paths = []
+        thumb = item.get("thumb")
+        if isinstance(thumb, str):
+            paths.append((thumb, "thumb"))
+        paths.extend((path, "gallery") for path in item.get("gallery") or [] if isinstance(path, str))
+        
+        references = []
+        for path, kind in paths:
+            if path.startswith("http") or not path.startswith(self.prefix):
+                continue
+            directory, _, name = path[len(self.prefix):].rpartition('/')
+            references.append((directory, name, kind))
+        return references
+    
+    def verify(self, items):
+        """Yield items in order, recording their asset problems (and dropping dead gallery entries)"""
+        from concurrent.futures import ThreadPoolExecutor
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asset-scan")
+        pending = deque()
+        try:
+            for item in items:
+                references = self._references(item)
+                new_directories = {}
+                for directory, name, _ in references:
+                    if directory not in self.listings:
+                        new_directories.setdefault(directory, set()).add(name)
+                for directory, names in new_directories.items():
+                    self.listings[directory] = pool.submit(self._list_directory, directory, names)
+                pending.append((item, references))
+                if len(pending) >= self.LOOKAHEAD:
+                    yield self._check(*pending.popleft())
+            while pending:
+                yield self._check(*pending.popleft())
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            # Listings that never ran must not stay in the cache
+            self.listings = {directory: future for directory, future in self.listings.items()
+                             if future.done() and not future.cancelled()}
+    
+    def _check(self, item, references):
+        self.items_checked += 1
+        if not references:
+            return item
+        
+        missing = []
+        zero_byte = []
+        dead = set()
+        referenced = {}
+        for directory, name, kind in references:
+            listing = self.listings[directory].result()
+            if isinstance(listing, OSError):
+                self.unreadable.setdefault(directory, str(listing))
+                continue
+            self.files_checked += 1
+            referenced.setdefault(directory, set()).add(name)
+            size = self._file_size(listing, directory, name) if listing is not None else None
+            path = f"{directory}/{name}" if directory else name
+            if size is None:
+                missing.append(path)
+            elif size == 0:
+                zero_byte.append(path)
+            else:
+                continue
+            if kind == "gallery":
+                dead.add(f"{self.prefix}{path}")
+        
+        extra = []
+        for directory, names in referenced.items():
+            listing = self.listings[directory].result()
+            if listing:
+                extra.extend(f"{directory}/{name}" if directory else name
+                             for name in sorted(listing) if name not in names)
+        
+        self.missing += len(missing)
+        self.zero_byte += len(zero_byte)
+        self.extra += len(extra)
+        if missing or zero_byte or extra:
+            self.problems.append({"slug": item.get("slug"), "missing": missing, "zero_byte": zero_byte,
+                                  "extra": extra})
+        
+        if self.drop_dead and dead:
+            item = self._drop_gallery_entries(item, dead)
+        return item
+    
+    def _drop_gallery_entries(self, item, dead):
+        gallery = item["gallery"]
+        if isinstance(gallery, GalleryPaths):
+            prefix = f"{gallery.base}/{gallery.slug}/"
+            kept = GalleryPaths(gallery.base, gallery.slug,
+                                [name for name in gallery.names if name.startswith("http") or prefix + name not in dead])
+        else:
+            kept = [path for path in gallery if path not in dead]
+        self.dropped += len(gallery) - len(kept)
+        if isinstance(item, ActressRecord):
+            return item.replace("gallery", kept)
+        item = dict(item)
+        item["gallery"] = kept
+        return item
+    
+    def to_dict(self):
+        return {
+            "asset_root": self.asset_root,
+            "items_checked": self.items_checked,
+            "files_checked": self.files_checked,
+            "directories_listed": len(self.listings),
+            "missing": self.missing,
+            "zero_byte": self.zero_byte,
+            "extra": self.extra,
+            "dropped_gallery_entries": self.dropped,
+            "unreadable_directories": [{"directory": directory, "error": error}
+                                       for directory, error in sorted(self.unreadable.items())],
+            "items": self.problems,
+        }
+    
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, indent=2, ensure_ascii=False)
+        print(f"✓ Asset report written to: {path}")
+    
+    def format(self):
+        text = (f"Assets: {self.files_checked} files checked in {len(self.listings)} directories - "
+                f"{self.missing} missing, {self.zero_byte} zero-byte, {self.extra} extra "
+                f"({len(self.problems)} items affected)")
+        if self.drop_dead:
+            text += f", {self.dropped} dead gallery entries dropped"
+        if self.unreadable:
+            text += f", {len(self.unreadable)} unreadable directories skipped"
+        return text
+
+class TimedIterator:
+    """Wraps an iterator and accumulates the wall and CPU time spent producing its items"""
+    def __init__(self, iterable):
+        self.iterator = iter(iterable)
+        self.count = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            item = next(self.iterator)
+        finally:
+            self.wall += time.perf_counter() - wall_start
+            self.cpu += time.thread_time() - cpu_start
+        self.count += 1
+        return item
+
+class StageTiming:
+    def __init__(self, items=0):
+        self.items = items
+
+class MergeReport:
+    """Wall time, CPU time and item counts per merge stage and per input file.
+    
+    Reading and process_file are timed per file (in the worker that ran them
+    when a process pool is used, so their totals can exceed elapsed time);
+    dedup, sort and write are timed once per merge. With profile set to
+    "cprofile" or "sampling", hot spots inside process_file are collected too.
+    """
+    PROFILE_MODES = ("cprofile", "sampling")
+    SAMPLE_INTERVAL = 0.005
+    HOTSPOT_COUNT = 20
+    
+    def __init__(self, profile=None):
+        if profile is not None and profile not in self.PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {profile}")
+        self.profile = profile
+        self.profiler = None
+        self.stages = {}
+        self.files = []
+        self.hotspots = []
+        self.started = time.perf_counter()
+        self.elapsed = None
+        self._sampler = None
+        self._sampler_stop = None
+        self._samples = {}
+    
+    def _add_stage(self, name, wall, cpu, items):
+        stage = self.stages.setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "items": 0, "calls": 0})
+        stage["wall_seconds"] += wall
+        stage["cpu_seconds"] += cpu
+        stage["items"] += items
+        stage["calls"] += 1
+    
+    @contextlib.contextmanager
+    def stage(self, name, items=0):
+        """Time a block as one call of stage name; set .items on the yielded object to record a count"""
+        timing = StageTiming(items)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield timing
+        finally:
+            self._add_stage(name, time.perf_counter() - wall_start, time.thread_time() - cpu_start, timing.items)
+    
+    def add_file(self, filepath, size, wall, cpu, items_read, items_processed, read_wall=0.0, read_cpu=0.0,
+                 source="parsed"):
+        self.add_file_record({
+            "file": filepath,
+            "source": source,
+            "bytes": size,
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "read_wall_seconds": read_wall,
+            "read_cpu_seconds": read_cpu,
+            "items_read": items_read,
+            "items_processed": items_processed,
+        })
+    
+    def add_file_record(self, record):
+        self.files.append(record)
+        if record["source"] == "cache":
+            self._add_stage("cache_load", record["wall_seconds"], record["cpu_seconds"], record["items_processed"])
+            return
+        self._add_stage("read", record["read_wall_seconds"], record["read_cpu_seconds"], record["items_read"])
+        self._add_stage("process", record["wall_seconds"] - record["read_wall_seconds"],
+                        record["cpu_seconds"] - record["read_cpu_seconds"], record["items_processed"])
+    
+    def start_profiling(self):
+        if self.profile == "cprofile":
+            import cProfile
+            self.profiler = cProfile.Profile()
+        elif self.profile == "sampling":
+            self._sampler_stop = threading.Event()
+            self._sampler = threading.Thread(target=self._sample, args=(threading.get_ident(),), daemon=True)
+            self._sampler.start()
+    
+    def _sample(self, thread_id):
+        """Count the innermost frame of thread_id whenever it is inside process_file"""
+        while not self._sampler_stop.wait(self.SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(thread_id)
+            innermost = frame
+            while frame is not None and frame.f_code.co_name != "process_file":
+                frame = frame.f_back
+            if frame is None or innermost is None:
+                continue
+            code = innermost.f_code
+            key = (code.co_filename, innermost.f_lineno, code.co_name)
+            self._samples[key] = self._samples.get(key, 0) + 1
+    
+    def finish(self, output_file=None):
+        self.elapsed = time.perf_counter() - self.started
+        if self._sampler is not None:
+            self._sampler_stop.set()
+            self._sampler.join()
+            self._sampler = None
+            total = sum(self._samples.values()) or 1
+            self.hotspots = [
+                {"function": name, "file": filename, "line": line, "samples": count, "share": count / total}
+                for (filename, line, name), count in
+                sorted(self._samples.items(), key=lambda entry: -entry[1])[:self.HOTSPOT_COUNT]
+            ]
+        elif self.profiler is not None:
+            import pstats
+            stats = pstats.Stats(self.profiler)
+            if output_file:
+                stats.dump_stats(f"{output_file}.prof")
+            ranked = sorted(stats.stats.items(), key=lambda entry: -entry[1][2])[:self.HOTSPOT_COUNT]
+            self.hotspots = [
+                {"function": name, "file": filename, "line": line, "calls": calls,
+                 "self_seconds": self_time, "cumulative_seconds": cumulative}
+                for (filename, line, name), (_, calls, self_time, cumulative, _) in ranked
+            ]
+    
+    def to_dict(self):
+        return {
+            "elapsed_seconds": self.elapsed,
+            "stages": self.stages,
+            "files": self.files,
+            "profile": self.profile,
+            "hotspots": self.hotspots,
+        }
+    
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, indent=2, ensure_ascii=False)
+        print(f"✓ Merge report written to: {path}")
+    
+    def format(self):
+        lines = [f"=== Merge Timings ({self.elapsed or 0:.3f}s) ==="]
+        for name, stage in self.stages.items():
+            lines.append(f"{name:<20}{stage['wall_seconds']:>9.3f}s wall {stage['cpu_seconds']:>9.3f}s cpu "
+                         f"{stage['items']:>10} items")
+        for hotspot in self.hotspots[:5]:
+            lines.append(f"hot: {hotspot['function']} ({os.path.basename(hotspot['file'])}:{hotspot['line']})")
+        return "\n".join(lines)
+
+class MergeCancelled(Exception):
+    """Raised inside a merge when it has been cancelled"""
+
+class MergeProgress:
+    """Progress of a running merge.
+    
+    Callbacks receive a snapshot copy, so they are free to hand it to
+    another thread. Reports are throttled to REPORT_INTERVAL seconds.
+    """
+    REPORT_INTERVAL = 0.1
+    
+    def __init__(self, input_files, callback=None):
+        self.callback = callback
+        self.stage = "processing"
+        self.total_files = len(input_files)
+        self.file_sizes = {}
+        for filepath in input_files:
+            try:
+                self.file_sizes[filepath] = os.path.getsize(filepath)
+            except OSError:
+                self.file_sizes[filepath] = 0
+        self.total_bytes = sum(self.file_sizes.values())
+        self.files_done = 0
+        self.bytes_read = 0
+        # filepath -> bytes of it already counted in bytes_read, for files still in progress
+        self._file_bytes = {}
+        self.items_read = 0
+        self.items_written = 0
+        self.current_file = None
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+        self._last_report = 0.0
+    
+    @property
+    def items_per_second(self):
+        return self.items_read / self.elapsed if self.elapsed > 0 else 0.0
+    
+    @property
+    def eta_seconds(self):
+        """Estimated seconds left in the processing stage, from the byte rate so far"""
+        if self.stage != "processing" or not self.bytes_read or self.elapsed <= 0:
+            return None
+        return self.elapsed * (self.total_bytes - self.bytes_read) / self.bytes_read
+    
+    @property
+    def fraction(self):
+        if self.stage == "done":
+            return 1.0
+        if self.total_bytes:
+            return self.bytes_read / self.total_bytes
+        return self.files_done / self.total_files if self.total_files else 0.0
+    
+    def file_read(self, filepath, position=None):
+        """Count filepath as read up to position bytes on disk (the whole file when position is None)"""
+        size = self.file_sizes.get(filepath, 0)
+        read = size if position is None else min(position, size)
+        counted = self._file_bytes.get(filepath, 0)
+        if read > counted:
+            self.bytes_read += read - counted
+            self._file_bytes[filepath] = read
+            self.report()
+    
+    def file_done(self, filepath, item_count):
+        self.files_done += 1
+        self.file_read(filepath)
+        self._file_bytes.pop(filepath, None)
+        self.items_read += item_count
+        self.current_file = os.path.basename(filepath)
+        self.report()
+    
+    def item_written(self):
+        self.items_written += 1
+        if self.callback is not None and self.items_written % 1000 == 0:
+            self.report()
+    
+    def set_stage(self, stage):
+        self.stage = stage
+        self.report(force=True)
+    
+    def finish(self):
+        self.set_stage("done")
+    
+    def report(self, force=False):
+        if self.callback is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_report < self.REPORT_INTERVAL:
+            return
+        self._last_report = now
+        self.elapsed = now - self.started
+        snapshot = copy.copy(self)
+        snapshot.callback = None
+        snapshot.file_sizes = None
+        self.callback(snapshot)
+
+class OutputEncoder:
+    """Turns a stream of items into text in one of JSONFileMerger.OUTPUT_FORMATS.
+    
+    cache, if given, maps id(item) -> (item, text) and is used to reuse the
+    text of items that were already encoded in this format.
+    """
+    OPENERS = {"pretty": "[\n  ", "compact": "[", "ndjson": ""}
+    SEPARATORS = {"pretty": ",\n  ", "compact": ",", "ndjson": ""}
+    
+    def __init__(self, output_format, codec, cache=None):
+        if output_format not in self.OPENERS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        self.output_format = output_format
+        self.codec = codec
+        self.cache = cache
+        self.count = 0
+    
+    def _encode_item(self, item):
+        # Expanded up front: going through the codec's default hook per record is much slower
+        if isinstance(item, ActressRecord):
+            item = item.expand()
+        if self.output_format == "ndjson":
+            return self.codec.dumps(item) + "\n"
+        if self.output_format == "compact":
+            return self.codec.dumps(item)
+        # Same bytes as json.dump(items, indent=2), one item at a time
+        return self.codec.dumps(item, pretty=True).replace("\n", "\n  ")
+    
+    def encode(self, item):
+        separator = self.SEPARATORS[self.output_format] if self.count else self.OPENERS[self.output_format]
+        self.count += 1
+        if self.cache is None:
+            return separator + self._encode_item(item)
+        entry = self.cache.get(id(item))
+        if entry is None or entry[0] is not item:
+            entry = self.cache[id(item)] = (item, self._encode_item(item))
+        return separator + entry[1]
+    
+    def close(self):
+        if self.output_format == "ndjson":
+            return ""
+        if not self.count:
+            return "[]"
+        return "\n]" if self.output_format == "pretty" else "]"
+
+class ShardWriter:
+    """Streams items into one shard temp file, hashing the bytes as they are written.
+    
+    The shard is named after its content hash (of the uncompressed text),
+    so it is only renamed into place by publish() once it is complete.
+    """
+    def __init__(self, directory, prefix, number, index, extension, output_format, codec, buffer_size, cache=None,
+                 compression=None, compress_level=None):
+        self.directory = directory
+        self.prefix = prefix
+        self.number = number
+        self.index = index
+        self.extension = extension
+        self.encoder = OutputEncoder(output_format, codec, cache)
+        fd, self.temp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+        self.raw = open(fd, 'wb', buffering=buffer_size)
+        self.file = open_compressor(self.raw, compression, compress_level) if compression else self.raw
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.filename = None
+    
+    @property
+    def count(self):
+        return self.encoder.count
+    
+    def _write(self, text):
+        data = text.encode('utf-8')
+        self.digest.update(data)
+        self.file.write(data)
+    
+    def write(self, item):
+        self._write(self.encoder.encode(item))
+    
+    def close(self):
+        self._write(self.encoder.close())
+        self.file.close()
+        self.raw.close()
+        self.size = os.path.getsize(self.temp_path)
+        self.filename = f"{self.prefix}-{self.number:04d}.{self.digest.hexdigest()[:12]}{self.extension}"
+    
+    def publish(self):
+        os.replace(self.temp_path, os.path.join(self.directory, self.filename))
+    
+    def discard(self):
+        self.file.close()
+        self.raw.close()
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
+
+class JSONFileMerger:
+    OUTPUT_FORMATS = ("pretty", "compact", "ndjson")
+    WRITE_BUFFER_SIZE = 1024 * 1024
+    SPILL_FAN_IN = 64
+    MANIFEST_VERSION = 1
+    MANIFEST_CARD_FIELDS = ("slug", "name", "thumb", "category")
+    # Shards being written at once with shard_by_category; each holds a buffer and a file descriptor
+    MAX_OPEN_SHARDS = 32
+    # Seconds between cancel checks while waiting on worker processes
+    CANCEL_POLL_INTERVAL = 0.1
+    
+    def __init__(self, codec="auto", compress_level=None):
+        self.codec = get_codec(codec)
+        # Level for .gz/.bz2/.xz outputs; None uses DEFAULT_COMPRESS_LEVELS
+        self.compress_level = compress_level
         self.merged_data = []
+        self.summary = MergeSummary()
+        self.cancelled = False
+        self.cancel_event = threading.Event()
+        self.progress = MergeProgress([])
+        self.report = MergeReport()
+        self.search_index = None
+        self.asset_verifier = None
+        # id(item) -> (item, formatted text), reused across writes when set (watch mode)
+        self.encoded_items = None
+    
+    @property
+    def merged_count(self):
+        return self.summary.total_items
         
     def extract_slug_from_filename(self, filename):
-        base_name = os.path.splitext(filename)[0]
+        base_name = os.path.splitext(split_compression_suffix(filename)[0])[0]
         slug = ''.join(c for c in base_name if c.isalnum() or c in ['-', '_']).lower()
         return slug
     
     def extract_name_from_filename(self, filename):
-        base_name = os.path.splitext(filename)[0]
+        base_name = os.path.splitext(split_compression_suffix(filename)[0])[0]
         name = base_name.replace('-', ' ').replace('_', ' ').title()
         return name
     
+    # Tokens the streaming reader has to inspect: whole strings (so their
+    # contents are skipped in one step), a lone quote when a string runs past
+    # the buffer, and brackets/commas. Everything else is skipped in bulk.
+    JSON_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|["\[\]{},]')
+    JSON_NON_WHITESPACE = re.compile(rb'\S')
+    READ_CHUNK_SIZE = 1024 * 1024
+    # Files up to this size are decoded in one codec call; larger ones are streamed
+    WHOLE_FILE_LIMIT = 8 * 1024 * 1024
+    
     def read_json_file(self, filepath):
+        """Yield items one at a time from a top-level JSON array or single object.
+        
+        gzip, bz2 and xz files are decompressed on the fly. Inputs up to
+        WHOLE_FILE_LIMIT bytes (uncompressed) are decoded in one call. Larger
+        ones (and small ones that fail to decode) are read in fixed-size
+        chunks with only the current element decoded, so memory stays flat
+        however large the input is. A malformed element is reported with its
+        (uncompressed) byte offset and skipped.
+        """
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                content = file.read().strip()
-                if content.startswith('{') and content.endswith('}'):
-                    return json.loads(content)
-                elif content.startswith('[') and content.endswith(']'):
-                    return json.loads(content)
-                else:
-                    print(f"Warning: Invalid JSON format in {filepath}")
-                    return None
-        except json.JSONDecodeError as e:
-            print(f"Error parsing {filepath}: {e}")
-            return None
+            with open(filepath, 'rb') as raw, open_input(raw) as file:
+                data = file.read(self.WHOLE_FILE_LIMIT + 1)
+                self.progress.file_read(filepath, raw.tell())
+                if len(data) <= self.WHOLE_FILE_LIMIT:
+                    items = self._decode_whole(data)
+                    if items is not None:
+                        yield from items
+                        return
+                    file = io.BytesIO(data)
+                    data = b''
+                yield from self._iter_json_stream(file, filepath, data, raw.tell)
         except Exception as e:
             print(f"Error reading {filepath}: {e}")
-            return None
     
-    def process_file(self, filepath, filename, image_base_path, preserve_metadata):
-        data = self.read_json_file(filepath)
-        if not data:
+    def _decode_whole(self, data):
+        """Decode a whole top-level array or object, or return None to fall back to streaming"""
+        match = self.JSON_NON_WHITESPACE.search(data)
+        if match is None or data[match.start()] not in b'[{':
+            return None
+        try:
+            value = self.codec.loads(data)
+        except ValueError:
             return None
+        if isinstance(value, list):
+            return value
+        return [value] if isinstance(value, dict) else None
+    
+    def _iter_json_stream(self, file, filepath, buf=b'', position=None):
+        """Yield the items of an already opened input; position() is its on-disk offset, for progress"""
+        base = 0  # absolute byte offset of buf[0]
+        pos = 0
+        generation = 0  # bumped whenever buf is replaced
+        eof = False
+        
+        # Decoded text of buf for the fast path: [generation, text, byte pos, char index, is_ascii]
+        window = None
+        decoder = json.JSONDecoder()
+        
+        def read_more():
+            """Append the next chunk, dropping consumed bytes. Returns the shift or None at EOF"""
+            nonlocal buf, base, pos, generation, eof
+            chunk = file.read(self.READ_CHUNK_SIZE)
+            if position is not None:
+                self.progress.file_read(filepath, position())
+            if not chunk:
+                eof = True
+                return None
+            shift = pos
+            buf = buf[pos:] + chunk
+            base += shift
+            pos = 0
+            generation += 1
+            return shift
+        
+        def fast_decode():
+            """Decode the element at pos with raw_decode on a text window of buf.
+            
+            Returns None when the element may run past the buffer or doesn't
+            decode; the caller then falls back to scan_value and the codec.
+            """
+            nonlocal pos, window
+            if window is None or window[0] != generation:
+                data = buf[pos:]
+                try:
+                    text = data.decode('utf-8')
+                except UnicodeDecodeError as e:
+                    # A character split at the end of the buffer is fine; bad UTF-8 earlier is left to the slow path
+                    text = data[:e.start].decode('utf-8') if e.start >= len(data) - 3 else None
+                window = [generation, text, pos, 0, text is not None and text.isascii()]
+            _, text, window_pos, index, is_ascii = window
+            if text is None:
+                return None
+            # Only ASCII whitespace and commas are skipped between elements
+            index += pos - window_pos
+            try:
+                value, end = decoder.raw_decode(text, index)
+            except ValueError:
+                return None
+            if end >= len(text):
+                if not eof:
+                    return None
+            elif text[end] not in ' \t\r\n,]':
+                # A number cut at the window edge, or junk after the value
+                return None
+            pos += end - index if is_ascii else len(text[index:end].encode('utf-8'))
+            window[2] = pos
+            window[3] = end
+            return (value,)
+        
+        def skip_whitespace():
+            nonlocal pos
+            while True:
+                match = self.JSON_NON_WHITESPACE.search(buf, pos)
+                if match:
+                    pos = match.start()
+                    return True
+                pos = len(buf)
+                if read_more() is None:
+                    return False
         
-        slug = self.extract_slug_from_filename(filename)
-        name = self.extract_name_from_filename(filename)
+        def scan_value():
+            """Find where the value starting at pos ends: a ',' or closing bracket at depth 0, or EOF"""
+            i = pos
+            depth = 0
+            while True:
+                match = self.JSON_TOKEN.search(buf, i)
+                # A lone quote means the string continues past the end of the buffer
+                if match is None or match.end() - match.start() == 1 and buf[match.start()] == 0x22:
+                    resume = len(buf) if match is None else match.start()
+                    shift = read_more()
+                    if shift is None:
+                        return len(buf), True
+                    i = resume - shift
+                    continue
+                i = match.end()
+                char = buf[match.start()]
+                if char == 0x22:  # a complete string
+                    continue
+                if char == 0x5b or char == 0x7b:  # [ {
+                    depth += 1
+                elif char == 0x5d or char == 0x7d:  # ] }
+                    if depth == 0:
+                        return match.start(), False
+                    depth -= 1
+                elif depth == 0:  # ,
+                    return match.start(), False
         
-        # Handle both single objects and arrays
-        items_to_process = []
-        if isinstance(data, list):
-            items_to_process = data
+        def decode(end):
+            try:
+                return self.codec.loads(buf[pos:end]), True
+            except ValueError as e:
+                print(f"Error parsing {filepath} at byte {base + pos}: {e}")
+                return None, False
+        
+        if not skip_whitespace():
+            print(f"Warning: Invalid JSON format in {filepath}")
+            return
+        while len(buf) - pos < 3 and read_more() is not None:
+            pass  # a BOM may straddle the first chunks
+        if buf.startswith(b'\xef\xbb\xbf', pos):
+            pos += 3
+            skip_whitespace()
+        
+        opener = buf[pos:pos + 1]
+        if opener == b'{':
+            end, _ = scan_value()
+            item, ok = decode(end)
+            pos = end
+            if ok:
+                yield item
+        elif opener == b'[':
+            pos += 1
+            while True:
+                if not skip_whitespace():
+                    print(f"Warning: Unterminated JSON array in {filepath}")
+                    return
+                if buf[pos:pos + 1] == b']':
+                    pos += 1
+                    break
+                decoded = fast_decode()
+                if decoded is not None:
+                    yield decoded[0]
+                    at_eof = False
+                else:
+                    end, at_eof = scan_value()
+                    item, ok = decode(end)
+                    pos = end
+                    window = None
+                    if ok:
+                        yield item
+                if at_eof:
+                    print(f"Warning: Unterminated JSON array in {filepath}")
+                    return
+                closer = buf[pos:pos + 1]
+                pos += 1
+                if closer == b']':
+                    break
+                if closer == b'}':
+                    print(f"Error parsing {filepath} at byte {base + pos - 1}: unexpected '}}'")
         else:
-            items_to_process = [data]
+            print(f"Warning: Invalid JSON format in {filepath}")
+            return
         
-        processed_items = []
+        if skip_whitespace():
+            print(f"Warning: Unexpected data after JSON value in {filepath} at byte {base + pos}")
+    
+    def process_file(self, filepath, filename, image_base_path, preserve_metadata):
+        """Process one input file, recording its timings in self.report"""
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        reader = TimedIterator(self.read_json_file(filepath))
         
-        for item_data in items_to_process:
+        profiler = self.report.profiler
+        if profiler is not None:
+            profiler.enable()
+        try:
+            processed_items = self._process_items(reader, filename, image_base_path, preserve_metadata)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+        
+        # Sizes come from the stat done for progress; pool workers have none and the parent fills them in
+        self.report.add_file(filepath, self.progress.file_sizes.get(filepath, 0), time.perf_counter() - wall_start,
+                             time.thread_time() - cpu_start, reader.count, len(processed_items), reader.wall,
+                             reader.cpu)
+        return processed_items
+    
+    def _process_items(self, items, filename, image_base_path, preserve_metadata):
+        return list(self._iter_processed_items(items, filename, image_base_path, preserve_metadata))
+    
+    def _iter_processed_items(self, items, filename, image_base_path, preserve_metadata):
+        # Items are streamed from the reader, so a huge array never sits in memory twice
+        for item_data in items:
+            if self.cancel_event.is_set():
+                raise MergeCancelled()
             if not isinstance(item_data, dict):
                 continue
             
@@ -372,17 +2098,10 @@ class JSONFileMerger:
                     # Generate local thumb path
                     merged_item["thumb"] = f"{image_base_path}/{slug}/thumb.jpg"
             
-            # Handle gallery paths
+            # Handle gallery paths - URLs are kept, local names are expanded under
+            # image_base_path/slug/ only when the item is written out
             if "gallery" in item_data:
-                gallery_with_paths = []
-                for gallery_item in item_data["gallery"]:
-                    if gallery_item.startswith("http"):
-                        # Keep URL images
-                        gallery_with_paths.append(gallery_item)
-                    else:
-                        # Convert to proper local path
-                        gallery_with_paths.append(f"{image_base_path}/{slug}/{gallery_item}")
-                merged_item["gallery"] = gallery_with_paths
+                merged_item["gallery"] = GalleryPaths(image_base_path, slug, item_data["gallery"])
             
             # Handle websites
             if "websites" in item_data and (not preserve_metadata or "websites" not in merged_item):
@@ -394,7 +2113,7 @@ class JSONFileMerger:
             
             # Set creation date if not preserving or if missing
             if not preserve_metadata or "createdAt" not in merged_item:
-                merged_item["createdAt"] = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.000Z")
+                merged_item["createdAt"] = StampedTime.now()
             
             # Preserve views and lastViewed if they exist
             if preserve_metadata:
@@ -403,69 +2122,1049 @@ class JSONFileMerger:
                 if "lastViewed" in item_data:
                     merged_item["lastViewed"] = item_data["lastViewed"]
             
-            processed_items.append(merged_item)
-        
-        return processed_items
+            yield ActressRecord(merged_item)
     
-    def merge_files(self, input_files, output_file, image_base_path="images/actresses", preserve_metadata=True):
-        print(f"Starting to merge {len(input_files)} files...")
-        self.merged_data = []
+    def iter_processed_files(self, input_files, image_base_path, preserve_metadata, workers=1, cache=None):
+        """Yield (filepath, processed_items) for each input, in input order.
         
+        With more than one worker the files are fanned out across a process
+        pool; results still come back in input order so dedup is unchanged.
+        Inputs found in the parse cache are loaded from it instead.
+        """
+        # Check the cache up front so only misses are handed to the workers
+        lookups = []
+        pending = []
         for filepath in input_files:
+            lookup = cache.lookup(filepath, image_base_path, preserve_metadata) if cache is not None else None
+            lookups.append(lookup)
+            if lookup is None or not lookup.hit:
+                pending.append(filepath)
+        
+        results = self._process_pending(pending, image_base_path, preserve_metadata, workers)
+        for filepath, lookup in zip(input_files, lookups):
+            self.check_cancelled()
             filename = os.path.basename(filepath)
-            print(f"Processing: {filename}")
-            
-            processed_items = self.process_file(filepath, filename, image_base_path, preserve_metadata)
-            if processed_items:
-                self.merged_data.extend(processed_items)
-                print(f"✓ Successfully processed: {filename} ({len(processed_items)} items)")
+            if lookup is not None and lookup.hit:
+                wall_start = time.perf_counter()
+                cpu_start = time.thread_time()
+                processed_items = cache.load(lookup)
+                if processed_items is not None:
+                    self.report.add_file(filepath, lookup.size, time.perf_counter() - wall_start,
+                                         time.thread_time() - cpu_start, len(processed_items), len(processed_items),
+                                         source="cache")
+                    print(f"Cached: {filename}")
+                    yield filepath, processed_items
+                    continue
+                # Evicted since the lookup - fall back to processing the file here
+                processed_items = self.process_file(filepath, filename, image_base_path, preserve_metadata)
             else:
-                print(f"✗ Failed to process: {filename}")
+                processed_items = next(results)
+            
+            if lookup is not None and processed_items is not None:
+                cache.store(lookup, processed_items)
+            yield filepath, processed_items
+        
+        if cache is not None:
+            cache.save()
+            print(f"Parse cache: {cache.hits} hit(s), {cache.misses} miss(es)")
+    
+    def _process_pending(self, input_files, image_base_path, preserve_metadata, workers):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(input_files))
+        
+        if workers <= 1:
+            for filepath in input_files:
+                filename = os.path.basename(filepath)
+                print(f"Processing: {filename}")
+                yield self.process_file(filepath, filename, image_base_path, preserve_metadata)
+            return
+        
+        if self.report.profile is not None:
+            print(f"Profiling enabled - processing files in this process instead of {workers} workers")
+            yield from self._process_pending(input_files, image_base_path, preserve_metadata, 1)
+            return
+        
+        print(f"Processing with {workers} worker processes...")
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = {executor.submit(process_file_worker, filepath, image_base_path, preserve_metadata,
+                                       self.codec.name): filepath
+                       for filepath in input_files}
+            outstanding = set(futures)
+            for future in list(futures):
+                # Count files as read as soon as any worker finishes them, not only in input order
+                while future in outstanding:
+                    done, outstanding = wait(outstanding, timeout=self.CANCEL_POLL_INTERVAL,
+                                             return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        self.progress.file_read(futures[finished])
+                    self.check_cancelled()
+                processed_items, file_record = future.result()
+                file_record["bytes"] = self.progress.file_sizes.get(file_record["file"], 0)
+                self.report.add_file_record(file_record)
+                yield processed_items
+        finally:
+            # On cancel, drop queued files and leave files already being parsed to
+            # finish in the background instead of waiting for their results
+            executor.shutdown(wait=not self.cancel_event.is_set(), cancel_futures=True)
+    
+    def cancel(self):
+        """Ask a running merge to stop; it exits at the next checkpoint without writing output"""
+        self.cancel_event.set()
+    
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise MergeCancelled()
+    
+    def begin_run(self, input_files, progress_callback=None, cancel_event=None, profile=None):
+        self.report = MergeReport(profile)
+        self.merged_data = []
+        self.summary = MergeSummary()
+        self.cancelled = False
+        self.cancel_event = cancel_event if cancel_event is not None else threading.Event()
+        self.progress = MergeProgress(input_files, progress_callback)
+        self.search_index = None
+        self.asset_verifier = None
+    
+    def merge_files(self, input_files, output_file, image_base_path="images/actresses", preserve_metadata=True,
+                    workers=1, cache_dir=None, cache_max_bytes=ParseCache.DEFAULT_MAX_BYTES, output_format="pretty",
+                    max_items_in_memory=None, spill_dir=None, progress_callback=None, cancel_event=None,
+                    write_report=False, profile=None, shard_size=None, shard_by_category=False,
+                    write_index=False, verify_assets=False, asset_root=None, drop_dead_assets=False):
+        """Merge input_files into output_file.
+        
+        With max_items_in_memory set, dedup and sorting are done by external
+        merge sort over temp files in spill_dir instead of in self.merged_data,
+        so the merged library never has to fit in RAM. The output is identical.
+        
+        progress_callback, if given, is called from the merging thread with a
+        MergeProgress snapshot. Setting cancel_event (or calling cancel())
+        stops the merge and leaves any existing output file untouched.
+        
+        Stage and per-file timings are kept in self.report; write_report also
+        saves them as <output_file>.report.json. profile ("cprofile" or
+        "sampling") additionally records hot spots inside process_file.
+        
+        shard_size and/or shard_by_category split the library into shards and
+        make output_file a manifest instead (see write_sharded_output).
         
-        # Remove duplicates based on slug
+        write_index also saves a SearchIndex of the output, built during the
+        write pass, as <output_file>.index.json.
+        
+        verify_assets checks local thumb and gallery images against asset_root
+        (default: image_base_path next to output_file) with an AssetVerifier
+        before writing, saves the findings as <output_file>.assets.json and,
+        with drop_dead_assets, removes missing or empty gallery entries.
+        """
+        print(f"Starting to merge {len(input_files)} files...")
+        self.begin_run(input_files, progress_callback, cancel_event, profile)
+        if write_index:
+            self.search_index = SearchIndex()
+        if verify_assets:
+            if asset_root is None:
+                asset_root = os.path.join(os.path.dirname(os.path.abspath(output_file)), image_base_path)
+            self.asset_verifier = AssetVerifier(asset_root, image_base_path, drop_dead=drop_dead_assets)
+        self.report.start_profiling()
+        try:
+            success = self._merge_files(input_files, output_file, image_base_path, preserve_metadata, workers,
+                                        cache_dir, cache_max_bytes, output_format, max_items_in_memory, spill_dir,
+                                        shard_size, shard_by_category)
+            if write_index and success:
+                success = self.write_search_index(f"{output_file}.index.json")
+            if verify_assets and success:
+                print(self.asset_verifier.format())
+                self.asset_verifier.write(f"{output_file}.assets.json")
+        except MergeCancelled:
+            self.cancelled = True
+            self.merged_data = []
+            print("✗ Merge cancelled - no output written")
+            return False
+        finally:
+            self.report.finish(output_file)
+        
+        print(self.report.format())
+        if write_report and success:
+            self.report.write(f"{output_file}.report.json")
+        return success
+    
+    def _merge_files(self, input_files, output_file, image_base_path, preserve_metadata, workers,
+                     cache_dir, cache_max_bytes, output_format, max_items_in_memory, spill_dir,
+                     shard_size=None, shard_by_category=False):
+        if max_items_in_memory:
+            if workers != 1 or cache_dir:
+                print("Bounded memory: streaming each file in this process (workers and parse cache not used)")
+            items = self.iter_streamed_input(input_files, image_base_path, preserve_metadata)
+            try:
+                # Inputs are consumed lazily inside this stage, so it includes their read/process time
+                with self.report.stage("external_sort_write") as stage:
+                    merged = self.external_merge(items, max_items_in_memory, spill_dir)
+                    if self.asset_verifier is not None:
+                        merged = self.asset_verifier.verify(merged)
+                    self.write_library(self.track_merged(merged), output_file, output_format, shard_size,
+                                       shard_by_category)
+                    stage.items = self.merged_count
+                print(f"\n✓ Successfully merged {self.merged_count} items into: {output_file}")
+                self.progress.finish()
+                return True
+            except MergeCancelled:
+                raise
+            except Exception as e:
+                print(f"✗ Error writing output file: {e}")
+                return False
+        
+        cache = ParseCache(cache_dir, cache_max_bytes) if cache_dir else None
+        self.merged_data = list(self.iter_merge_input(input_files, image_base_path, preserve_metadata, workers,
+                                                      cache))
+        self.progress.set_stage("deduplicating")
+        
+        with self.report.stage("dedup", len(self.merged_data)):
+            self.merged_data = self.dedup_items(self.merged_data)
+        self.check_cancelled()
+        
+        self.progress.set_stage("sorting")
+        with self.report.stage("sort", len(self.merged_data)):
+            self.sort_items(self.merged_data)
+        
+        # Check image assets against the disk before anything is written
+        if self.asset_verifier is not None:
+            self.progress.set_stage("verifying")
+            with self.report.stage("verify", len(self.merged_data)):
+                verified = []
+                for item in self.asset_verifier.verify(self.merged_data):
+                    self.check_cancelled()
+                    verified.append(item)
+            self.merged_data = verified
+        
+        try:
+            with self.report.stage("write", len(self.merged_data)):
+                self.write_library(self.track_merged(self.merged_data), output_file, output_format,
+                                   shard_size, shard_by_category)
+            print(f"\n✓ Successfully merged {len(self.merged_data)} items into: {output_file}")
+            self.progress.finish()
+            return True
+        except MergeCancelled:
+            raise
+        except Exception as e:
+            print(f"✗ Error writing output file: {e}")
+            return False
+    
+    @staticmethod
+    def dedup_items(items):
+        """Remove duplicates based on slug, keeping the first item seen"""
         seen_slugs = set()
         unique_data = []
-        for item in self.merged_data:
+        for item in items:
             if item["slug"] not in seen_slugs:
                 seen_slugs.add(item["slug"])
                 unique_data.append(item)
+        return unique_data
+    
+    @staticmethod
+    def sort_items(items):
+        """Sort items in place by creation date (newest first)"""
+        items.sort(key=lambda x: x.get("createdAt", ""), reverse=True)
+    
+    def upsert_files(self, input_files, store_path, image_base_path="images/actresses", preserve_metadata=True,
+                     workers=1, cache_dir=None, cache_max_bytes=ParseCache.DEFAULT_MAX_BYTES):
+        """Process input_files and upsert them into the library store at store_path"""
+        print(f"Upserting {len(input_files)} files into library: {store_path}")
+        self.begin_run(input_files)
+        cache = ParseCache(cache_dir, cache_max_bytes) if cache_dir else None
+        items = self.iter_merge_input(input_files, image_base_path, preserve_metadata, workers, cache)
+        
+        try:
+            with LibraryStore(store_path, self.codec) as store:
+                inserted, updated = store.upsert(items, preserve_metadata)
+                print(f"\n✓ Added {inserted} and updated {updated} items ({store.count()} in library)")
+            return True
+        except Exception as e:
+            print(f"✗ Error updating library store: {e}")
+            return False
+    
+    def export_library(self, store_path, output_file, output_format="pretty", changes_only=False, shard_size=None,
+                       shard_by_category=False):
+        """Write the library store (or only its changes since the last export) to output_file"""
+        self.summary = MergeSummary()
+        try:
+            with LibraryStore(store_path, self.codec) as store:
+                self.write_library(self.track_merged(store.iter_items(changes_only)), output_file, output_format,
+                                   shard_size, shard_by_category)
+                store.mark_exported()
+            print(f"✓ Exported {self.merged_count} items into: {output_file}")
+            return True
+        except Exception as e:
+            print(f"✗ Error exporting library: {e}")
+            return False
+    
+    def iter_merge_input(self, input_files, image_base_path, preserve_metadata, workers=1, cache=None):
+        """Yield every processed item from input_files, in input order"""
+        for filepath, processed_items in self.iter_processed_files(input_files, image_base_path, preserve_metadata,
+                                                                   workers, cache):
+            filename = os.path.basename(filepath)
+            self.progress.file_done(filepath, len(processed_items) if processed_items else 0)
+            if processed_items:
+                yield from processed_items
+                print(f"✓ Successfully processed: {filename} ({len(processed_items)} items)")
+            else:
+                print(f"✗ Failed to process: {filename}")
+            self.check_cancelled()
+        self.progress.set_stage("writing")
+    
+    def iter_streamed_input(self, input_files, image_base_path, preserve_metadata):
+        """Yield every processed item from input_files, in input order, as each file is read.
+        
+        Unlike iter_merge_input no file is ever collected into a list, so a
+        single huge input only holds the item being processed; files are
+        read in this process and the parse cache is not used.
+        """
+        for filepath in input_files:
+            self.check_cancelled()
+            filename = os.path.basename(filepath)
+            print(f"Processing: {filename}")
+            reader = TimedIterator(self.read_json_file(filepath))
+            processed = TimedIterator(self._iter_processed_items(reader, filename, image_base_path,
+                                                                 preserve_metadata))
+            profiler = self.report.profiler
+            while True:
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    item = next(processed, None)
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+                if item is None:
+                    break
+                yield item
+            # Timed per item, so the time spent downstream between items isn't counted
+            self.report.add_file(filepath, self.progress.file_sizes.get(filepath, 0), processed.wall, processed.cpu,
+                                 reader.count, processed.count, reader.wall, reader.cpu)
+            self.progress.file_done(filepath, processed.count)
+            if processed.count:
+                print(f"✓ Successfully processed: {filename} ({processed.count} items)")
+            else:
+                print(f"✗ Failed to process: {filename}")
+        self.progress.set_stage("writing")
+    
+    def track_merged(self, items):
+        """Pass items through, collecting summary statistics as they are written"""
+        for item in items:
+            if self.cancel_event.is_set():
+                raise MergeCancelled()
+            self.summary.add(item)
+            if self.search_index is not None:
+                self.search_index.add(item)
+            self.progress.item_written()
+            yield item
+    
+    def external_merge(self, items, max_items_in_memory, spill_dir=None):
+        """Dedup by slug and sort by createdAt, holding at most max_items_in_memory items at a time.
+        
+        Pass one spills runs sorted by (slug, input position) and k-way merges
+        them, keeping the first item seen for each slug. Pass two spills the
+        winners sorted by createdAt (newest first, ties in input order) and
+        merges those runs into the final stream - the same order the stable
+        in-memory sort produces.
+        """
+        with tempfile.TemporaryDirectory(prefix="merge-spill-", dir=spill_dir) as run_dir:
+            keyed = (((item["slug"], position), item) for position, item in enumerate(items))
+            slug_runs = self._spill_sorted_runs(keyed, run_dir, max_items_in_memory)
+            
+            def winners():
+                previous_slug = None
+                for (slug, position), item in self._merge_runs(slug_runs, run_dir):
+                    if slug != previous_slug:
+                        previous_slug = slug
+                        yield (item.get("createdAt", ""), -position), item
+            
+            date_runs = self._spill_sorted_runs(winners(), run_dir, max_items_in_memory, reverse=True)
+            for _, item in self._merge_runs(date_runs, run_dir, reverse=True):
+                yield item
+    
+    def _spill_sorted_runs(self, keyed_items, run_dir, max_items_in_memory, reverse=False):
+        run_paths = []
+        batch = []
+        for keyed_item in keyed_items:
+            batch.append(keyed_item)
+            if len(batch) >= max_items_in_memory:
+                batch.sort(key=lambda pair: pair[0], reverse=reverse)
+                run_paths.append(self._write_run(batch, run_dir))
+                batch = []
+        if batch:
+            batch.sort(key=lambda pair: pair[0], reverse=reverse)
+            run_paths.append(self._write_run(batch, run_dir))
+        return run_paths
+    
+    def _write_run(self, keyed_items, run_dir):
+        fd, run_path = tempfile.mkstemp(suffix=".run", dir=run_dir)
+        with open(fd, 'w', encoding='utf-8', buffering=self.WRITE_BUFFER_SIZE) as file:
+            for key, item in keyed_items:
+                file.write(self.codec.dumps([key, item]))
+                file.write("\n")
+        return run_path
+    
+    def _read_run(self, run_path):
+        with open(run_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                key, item = self.codec.loads(line)
+                yield tuple(key), item
+        os.remove(run_path)
+    
+    def _merge_runs(self, run_paths, run_dir, reverse=False):
+        # Merge in rounds so we never hold more than SPILL_FAN_IN run files open
+        while len(run_paths) > self.SPILL_FAN_IN:
+            run_paths = [
+                self._write_run(heapq.merge(*(self._read_run(path) for path in run_paths[i:i + self.SPILL_FAN_IN]),
+                                            key=lambda pair: pair[0], reverse=reverse), run_dir)
+                for i in range(0, len(run_paths), self.SPILL_FAN_IN)
+            ]
+        return heapq.merge(*(self._read_run(path) for path in run_paths), key=lambda pair: pair[0], reverse=reverse)
+    
+    def write_output(self, items, output_file, output_format="pretty"):
+        """Write items incrementally in one of OUTPUT_FORMATS.
         
-        self.merged_data = unique_data
+        Output goes to a temp file next to output_file which is renamed into
+        place only once everything has been written, so a crash never leaves
+        a half-written file behind. An output_file ending in .gz, .bz2 or .xz
+        is compressed at self.compress_level.
+        """
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
         
-        # Sort by creation date (newest first)
-        self.merged_data.sort(key=lambda x: x.get("createdAt", ""), reverse=True)
+        # Create directory if it doesn't exist
+        os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else '.', exist_ok=True)
         
+        temp_file = f"{output_file}.{os.getpid()}.tmp"
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else '.', exist_ok=True)
+            with self.open_output(temp_file, output_file) as file:
+                encoder = OutputEncoder(output_format, self.codec, self.encoded_items)
+                file.writelines(map(encoder.encode, items))
+                file.write(encoder.close())
+            os.replace(temp_file, output_file)
+        except BaseException:
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+            raise
+    
+    @contextlib.contextmanager
+    def open_output(self, temp_file, output_file):
+        """Open temp_file for text output, compressed as output_file's suffix asks"""
+        compression = split_compression_suffix(output_file)[1]
+        if compression is None:
+            with open(temp_file, 'w', encoding='utf-8', buffering=self.WRITE_BUFFER_SIZE) as file:
+                yield file
+            return
+        with open(temp_file, 'wb') as raw, open_compressor(raw, compression, self.compress_level) as compressed:
+            with io.TextIOWrapper(io.BufferedWriter(compressed, self.WRITE_BUFFER_SIZE), encoding='utf-8') as file:
+                yield file
+    
+    def write_library(self, items, output_file, output_format="pretty", shard_size=None, shard_by_category=False):
+        """Write items as one file, or as shards plus a manifest when sharding is requested"""
+        if shard_size or shard_by_category:
+            self.write_sharded_output(items, output_file, output_format, shard_size, shard_by_category)
+        else:
+            self.write_output(items, output_file, output_format)
+    
+    @staticmethod
+    def shard_prefix(category):
+        prefix = re.sub(r'[^\w-]+', '_', str(category).strip().lower()).strip('_')
+        return prefix or "uncategorized"
+    
+    def write_sharded_output(self, items, manifest_file, output_format="pretty", shard_size=None,
+                             shard_by_category=False):
+        """Write items as shards of at most shard_size items (per category with shard_by_category).
+        
+        Shards go to <manifest stem>-shards/ next to manifest_file and are
+        named after their content hash. The manifest lists every shard with
+        its item count and sha256, followed by one light card per item
+        (MANIFEST_CARD_FIELDS plus its shard number) in output order, so a
+        frontend can render the grid from the manifest alone and fetch a
+        shard only when it needs the full record.
+        
+        With shard_by_category at most MAX_OPEN_SHARDS shards are written at
+        once; a category whose shard was closed to make room continues in a
+        new one.
+        
+        Nothing is published until every shard is complete; the manifest is
+        replaced last, after which shards only the old manifest referenced
+        are removed. A compressed manifest name (e.g. library.json.gz) makes
+        the shards compressed the same way.
+        """
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        if shard_size is not None and shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        
+        manifest_dir = os.path.dirname(manifest_file) or '.'
+        manifest_name, compression = split_compression_suffix(os.path.basename(manifest_file))
+        stem, extension = os.path.splitext(manifest_name)
+        extension = extension or ".json"
+        if compression:
+            extension += os.path.splitext(manifest_file)[1]
+        shard_dirname = f"{stem}-shards"
+        shard_dir = os.path.join(manifest_dir, shard_dirname)
+        os.makedirs(shard_dir, exist_ok=True)
+        
+        writers = []
+        shard_categories = []
+        # Keyed by the category itself: categories such as "Only Fans" and "only_fans"
+        # share a sanitized name, so later ones get a numbered prefix of their own
+        prefixes = {}  # category key -> shard prefix
+        used_prefixes = set()
+        last_numbers = {}  # category key -> number of its latest shard
+        open_writers = {}  # category key -> writer still taking items, least recently used first
+        cards = []
+        try:
+            for item in items:
+                category = item.get("category", "")
+                key = (type(category).__name__, str(category)) if shard_by_category else None
+                writer = open_writers.get(key)
+                if writer is None or (shard_size and writer.count >= shard_size):
+                    if writer is not None:
+                        writer.close()
+                        del open_writers[key]
+                    elif len(open_writers) >= self.MAX_OPEN_SHARDS:
+                        # Close the idle one; its category starts a new shard if it comes back
+                        open_writers.pop(next(iter(open_writers))).close()
+                    prefix = prefixes.get(key)
+                    if prefix is None:
+                        prefix = base_prefix = self.shard_prefix(category) if shard_by_category else "shard"
+                        suffix = 1
+                        while prefix in used_prefixes:
+                            suffix += 1
+                            prefix = f"{base_prefix}_{suffix}"
+                        prefixes[key] = prefix
+                        used_prefixes.add(prefix)
+                    last_numbers[key] = number = last_numbers.get(key, 0) + 1
+                    writer = ShardWriter(shard_dir, prefix, number, len(writers), extension, output_format,
+                                         self.codec, self.WRITE_BUFFER_SIZE, self.encoded_items, compression,
+                                         self.compress_level)
+                    writers.append(writer)
+                    shard_categories.append(category)
+                    open_writers[key] = writer
+                elif shard_by_category:
+                    open_writers[key] = open_writers.pop(key)
+                writer.write(item)
+                
+                card = {field: item[field] for field in self.MANIFEST_CARD_FIELDS if field in item}
+                card["shard"] = writer.index
+                cards.append(card)
             
-            with open(output_file, 'w', encoding='utf-8') as file:
-                json.dump(self.merged_data, file, indent=2, ensure_ascii=False)
-            print(f"\n✓ Successfully merged {len(self.merged_data)} items into: {output_file}")
+            for writer in open_writers.values():
+                writer.close()
+            
+            shards = []
+            for writer, category in zip(writers, shard_categories):
+                shard = {"file": f"{shard_dirname}/{writer.filename}", "count": writer.count,
+                         "bytes": writer.size, "sha256": writer.digest.hexdigest()}
+                if shard_by_category:
+                    shard["category"] = category
+                shards.append(shard)
+            manifest = {
+                "version": self.MANIFEST_VERSION,
+                "format": output_format,
+                "total": len(cards),
+                "shard_size": shard_size,
+                "sharded_by": "category" if shard_by_category else "size",
+                "shards": shards,
+                "items": cards,
+            }
+            
+            previous_files = self._manifest_shard_files(manifest_file)
+            for writer in writers:
+                writer.publish()
+            self.write_text_atomic(manifest_file, self.codec.dumps(manifest, pretty=output_format == "pretty"))
+        except BaseException:
+            for writer in writers:
+                writer.discard()
+            raise
+        
+        current_files = {shard["file"] for shard in shards}
+        for stale in previous_files - current_files:
+            # Only ever delete our own shards, whatever the old manifest says
+            if os.path.dirname(stale) != shard_dirname:
+                continue
+            try:
+                os.remove(os.path.join(manifest_dir, stale))
+            except OSError:
+                pass
+    
+    def _manifest_shard_files(self, manifest_file):
+        """Shard paths referenced by an existing manifest, or an empty set"""
+        try:
+            with open_input(manifest_file) as file:
+                manifest = self.codec.loads(file.read())
+            return {shard["file"] for shard in manifest["shards"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            return set()
+    
+    def write_text_atomic(self, output_file, text):
+        temp_file = f"{output_file}.{os.getpid()}.tmp"
+        try:
+            with self.open_output(temp_file, output_file) as file:
+                file.write(text)
+            os.replace(temp_file, output_file)
+        except BaseException:
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+            raise
+    
+    def write_search_index(self, index_file):
+        try:
+            with self.report.stage("index", len(self.search_index.slugs)):
+                self.write_text_atomic(index_file, self.codec.dumps(self.search_index.to_dict()))
+            print(f"✓ Search index written to: {index_file}")
             return True
         except Exception as e:
-            print(f"✗ Error writing output file: {e}")
+            print(f"✗ Error writing search index: {e}")
             return False
     
     def get_merge_summary(self):
-        summary = f"=== Merge Summary ===\n"
-        summary += f"Total items merged: {len(self.merged_data)}\n\n"
+        parts = [f"=== Merge Summary ===\n{self.summary.format()}\n\n"]
         
         for item in self.merged_data:
-            summary += f"• {item['name']} ({item['slug']})\n"
-            summary += f"  Category: {item.get('category', 'N/A')}\n"
-            summary += f"  Thumb: {item.get('thumb', 'N/A')}\n"
-            summary += f"  Websites: {len(item.get('websites', []))}\n"
-            summary += f"  Gallery: {len(item.get('gallery', []))}\n"
-            summary += f"  Views: {item.get('views', 'N/A')}\n"
-            summary += f"  Created: {item.get('createdAt', 'N/A')}\n\n"
+            parts.append(
+                f"• {item['name']} ({item['slug']})\n"
+                f"  Category: {item.get('category', 'N/A')}\n"
+                f"  Thumb: {item.get('thumb', 'N/A')}\n"
+                f"  Websites: {len(item.get('websites', []))}\n"
+                f"  Gallery: {len(item.get('gallery', []))}\n"
+                f"  Views: {item.get('views', 'N/A')}\n"
+                f"  Created: {item.get('createdAt', 'N/A')}\n\n"
+            )
         
-        return summary
+        return "".join(parts)
+
+def process_file_worker(filepath, image_base_path, preserve_metadata, codec="auto"):
+    """Process pool entry point: run process_file for one input in a fresh merger.
+    
+    Returns the processed items together with the file's timing record.
+    """
+    merger = JSONFileMerger(codec)
+    processed_items = merger.process_file(filepath, os.path.basename(filepath), image_base_path, preserve_metadata)
+    return processed_items, merger.report.files[-1]
+
+DEFAULT_INPUT_PATTERNS = tuple(f"*{extension}{suffix}" for extension in (".json", ".txt")
+                               for suffix in ("", *COMPRESSION_SUFFIXES))
 
-def main():
+def collect_input_files(paths, recursive=False, patterns=DEFAULT_INPUT_PATTERNS):
+    """Expand files, directories and glob patterns into a list of input files.
+    
+    Directories contribute the files matching patterns (descending into
+    subdirectories when recursive). Duplicates are dropped, order is kept.
+    """
+    input_files = []
+    walk_input_files(paths, lambda filepath, entry: input_files.append(filepath), recursive, patterns)
+    return input_files
+
+def walk_input_files(paths, callback, recursive=False, patterns=DEFAULT_INPUT_PATTERNS, warn=True):
+    """Call callback(filepath, entry) for each input file, in input order, once per file.
+    
+    entry is the os.DirEntry the file was found through, or None for files
+    named directly.
+    """
+    seen = set()
+    
+    def add(filepath, entry=None):
+        key = os.path.abspath(filepath)
+        if key not in seen:
+            seen.add(key)
+            callback(filepath, entry)
+    
+    def add_directory(directory):
+        try:
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError as e:
+            if warn:
+                print(f"Warning: Cannot read directory {directory}: {e}")
+            return
+        for entry in entries:
+            if entry.is_dir():
+                if recursive:
+                    add_directory(entry.path)
+            elif any(fnmatch.fnmatch(entry.name, pattern) for pattern in patterns):
+                add(entry.path, entry)
+    
+    for path in paths:
+        if os.path.isdir(path):
+            add_directory(path)
+        elif glob.has_magic(path):
+            for match in sorted(glob.glob(path, recursive=recursive)):
+                if os.path.isdir(match):
+                    add_directory(match)
+                else:
+                    add(match)
+        elif os.path.isfile(path):
+            add(path)
+        elif warn:
+            print(f"Warning: No such file or directory: {path}")
+
+class LibraryWatcher:
+    """Keeps a merged library in memory and rewrites the output as input files change.
+    
+    Every poll_interval seconds the inputs are rescanned with os.scandir and
+    compared by (mtime, size). Changes are applied once a scan has stayed
+    the same for debounce seconds, so half-copied files are not picked up.
+    Only added and changed files are processed again; dedup winners are
+    recomputed for the slugs they touch, the near-sorted output order is
+    re-sorted and the output is rewritten from cached item encodings.
+    The output matches merge_files over the same inputs; the merge summary
+    is not kept up to date.
+    
+    A file that fails to process is logged and counted as holding no items
+    until it changes again, and a failed output write is retried on the
+    next polls, so a bad input or a full disk never stops the watch.
+    """
+    def __init__(self, merger, paths, output_file, image_base_path="images/actresses", preserve_metadata=True,
+                 output_format="pretty", recursive=False, patterns=DEFAULT_INPUT_PATTERNS, workers=1,
+                 poll_interval=1.0, debounce=0.5, shard_size=None, shard_by_category=False):
+        self.merger = merger
+        self.paths = paths
+        self.output_file = output_file
+        self.image_base_path = image_base_path
+        self.preserve_metadata = preserve_metadata
+        self.output_format = output_format
+        self.recursive = recursive
+        self.patterns = patterns
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.shard_size = shard_size
+        self.shard_by_category = shard_by_category
+        
+        merger.encoded_items = {}
+        self.signatures = {}  # filepath -> (mtime_ns, size), in input order
+        self.ranks = {}  # filepath -> position in input order
+        self.file_items = {}  # filepath -> processed items
+        self.candidates = {}  # slug -> {filepath: (position, item)} for every file holding the slug
+        # slug -> (sort key, filepath, position, item) that survives dedup
+        self.winners = {}
+        self.ordered = []  # winners in output order
+        self.unwritten = False  # the last write failed, so the output is behind the library
+    
+    def scan(self):
+        """Current {filepath: (mtime_ns, size)} of the inputs, in input order"""
+        snapshot = {}
+        
+        def add(filepath, entry):
+            try:
+                stat = entry.stat() if entry is not None else os.stat(filepath)
+            except OSError:
+                return  # removed while scanning
+            snapshot[filepath] = (stat.st_mtime_ns, stat.st_size)
+        
+        walk_input_files(self.paths, add, self.recursive, self.patterns, warn=False)
+        return snapshot
+    
+    def _drop_file(self, filepath):
+        slugs = set()
+        for item in self.file_items.pop(filepath, []):
+            slug = item["slug"]
+            slugs.add(slug)
+            holders = self.candidates.get(slug)
+            if holders is not None:
+                holders.pop(filepath, None)
+                if not holders:
+                    del self.candidates[slug]
+            self.merger.encoded_items.pop(id(item), None)
+        return slugs
+    
+    def _add_file(self, filepath, items):
+        slugs = set()
+        self.file_items[filepath] = items
+        for position, item in enumerate(items):
+            slug = item["slug"]
+            slugs.add(slug)
+            # Within a file the first occurrence wins, as in merge_files
+            self.candidates.setdefault(slug, {}).setdefault(filepath, (position, item))
+        return slugs
+    
+    def _process_changed(self, changed):
+        """{filepath: processed items} for changed; files that fail to process get no items"""
+        # A fresh report per round, so a long-running watch doesn't accumulate file records
+        self.merger.report = MergeReport()
+        results = {}
+        try:
+            for filepath, processed_items in self.merger.iter_processed_files(changed, self.image_base_path,
+                                                                              self.preserve_metadata, self.workers):
+                results[filepath] = processed_items
+        except MergeCancelled:
+            raise
+        except Exception as e:
+            # Go through the rest one by one so a single bad file doesn't hold back the others
+            print(f"✗ Processing failed ({e}) - retrying the remaining files one at a time")
+            for filepath in changed:
+                if filepath in results:
+                    continue
+                filename = os.path.basename(filepath)
+                try:
+                    results[filepath] = self.merger.process_file(filepath, filename, self.image_base_path,
+                                                                 self.preserve_metadata)
+                except MergeCancelled:
+                    raise
+                except Exception as e:
+                    print(f"✗ Error processing {filename}: {e}")
+                    results[filepath] = None
+        
+        for filepath in changed:
+            if not results.get(filepath):
+                print(f"✗ Failed to process: {os.path.basename(filepath)}")
+                results[filepath] = []
+        return results
+    
+    def apply(self, snapshot):
+        """Bring the library up to date with snapshot and rewrite the output. Returns the changed file count"""
+        started = time.perf_counter()
+        removed = [filepath for filepath in self.signatures if filepath not in snapshot]
+        changed = [filepath for filepath, signature in snapshot.items() if self.signatures.get(filepath) != signature]
+        
+        # Process before touching the library, so a failure here leaves it as it was
+        processed = self._process_changed(changed)
+        
+        affected = set()
+        for filepath in removed + changed:
+            affected |= self._drop_file(filepath)
+        
+        item_count = 0
+        for filepath in changed:
+            item_count += len(processed[filepath])
+            affected |= self._add_file(filepath, processed[filepath])
+        
+        files_moved = list(snapshot) != list(self.signatures)
+        self.signatures = snapshot
+        if files_moved:
+            self.ranks = {filepath: rank for rank, filepath in enumerate(snapshot)}
+        
+        for slug in affected:
+            holders = self.candidates.get(slug)
+            if holders:
+                filepath = min(holders, key=self.ranks.__getitem__)
+                self.winners[slug] = self._winner(filepath, *holders[filepath])
+            else:
+                self.winners.pop(slug, None)
+        
+        self.ordered = [winner for winner in self.ordered if winner[3]["slug"] not in affected]
+        if files_moved:
+            # Input ranks shifted, so every sort key has to be rebuilt
+            self.ordered = [self._winner(*winner[1:]) for winner in self.ordered]
+            self.winners.update((winner[3]["slug"], winner) for winner in self.ordered)
+        self.ordered.extend(self.winners[slug] for slug in affected if slug in self.winners)
+        # The previous order is kept, so the sort only has to place the new entries
+        self.ordered.sort(key=lambda winner: winner[0], reverse=True)
+        
+        if self.try_write():
+            print(f"✓ Applied {len(changed)} changed and {len(removed)} removed file(s) ({item_count} items) - "
+                  f"{len(self.ordered)} items written in {time.perf_counter() - started:.3f}s")
+        return len(changed) + len(removed)
+    
+    def _winner(self, filepath, position, item):
+        # Newest first, ties in input order - the same order as merge_files
+        return (item.get("createdAt", ""), -self.ranks[filepath], -position), filepath, position, item
+    
+    def write(self):
+        merger = self.merger
+        merger.merged_data = [winner[3] for winner in self.ordered]
+        merger.write_library(merger.merged_data, self.output_file, self.output_format, self.shard_size,
+                             self.shard_by_category)
+    
+    def try_write(self):
+        """write(), logging a failure instead of raising it. Returns whether the output is up to date"""
+        try:
+            self.write()
+        except OSError as e:
+            if not self.unwritten:
+                print(f"✗ Could not write {self.output_file}: {e} - retrying while watching")
+            self.unwritten = True
+            return False
+        if self.unwritten:
+            print(f"✓ Wrote {self.output_file} ({len(self.ordered)} items)")
+        self.unwritten = False
+        return True
+    
+    def _apply_logged(self, snapshot):
+        try:
+            self.apply(snapshot)
+        except MergeCancelled:
+            raise
+        except Exception as e:
+            # Signatures are only updated by a successful apply, so the change is picked up again
+            print(f"✗ Could not apply changes: {e}")
+    
+    def run(self, stop_event=None):
+        """Merge once, then keep applying changes until stop_event is set"""
+        stop_event = stop_event if stop_event is not None else threading.Event()
+        self._apply_logged(self.scan())
+        print(f"Watching {len(self.signatures)} files for changes (Ctrl+C to stop)...")
+        
+        pending = None
+        changed_at = 0.0
+        while not stop_event.wait(self.poll_interval):
+            try:
+                snapshot = self.scan()
+            except OSError as e:
+                print(f"✗ Could not scan inputs: {e}")
+                continue
+            if snapshot == self.signatures:
+                pending = None
+                if self.unwritten:
+                    self.try_write()
+            elif snapshot != pending:
+                # Still changing - wait for it to settle
+                pending = snapshot
+                changed_at = time.monotonic()
+            elif time.monotonic() - changed_at >= self.debounce:
+                self._apply_logged(snapshot)
+                pending = None
+
+def build_arg_parser():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Merge actress JSON/TXT files. Run without arguments to open the GUI.")
+    parser.add_argument("inputs", nargs="*", help="input files, directories or glob patterns")
+    parser.add_argument("-o", "--output",
+                        help="merged output file (or export target with --store); .gz/.bz2/.xz are compressed")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="descend into subdirectories and allow ** in glob patterns")
+    parser.add_argument("--pattern", action="append", dest="patterns",
+                        help="filename pattern for directory inputs "
+                             "(repeatable, default: *.json, *.txt and their .gz/.bz2/.xz forms)")
+    parser.add_argument("--image-base-path", default="images/actresses", help="base path for local images")
+    parser.add_argument("--no-preserve-metadata", dest="preserve_metadata", action="store_false",
+                        help="regenerate names, dates and paths instead of keeping the originals")
+    parser.add_argument("--format", dest="output_format", choices=JSONFileMerger.OUTPUT_FORMATS, default="pretty",
+                        help="output format (default: pretty)")
+    parser.add_argument("--shard-size", type=int,
+                        help="split the output into shards of this many items; -o then names the manifest")
+    parser.add_argument("--shard-by-category", action="store_true",
+                        help="write one shard set per category; -o then names the manifest")
+    parser.add_argument("--compress-level", type=int,
+                        help="compression level for .gz/.bz2/.xz outputs (gzip and xz 0-9, bz2 1-9)")
+    parser.add_argument("--json-backend", choices=JSON_BACKENDS, default="auto",
+                        help="JSON codec (default: orjson when installed, else the stdlib json module)")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="worker processes for parsing (default: 1)")
+    parser.add_argument("--cache-dir", help="directory for the persistent parse cache")
+    parser.add_argument("--cache-max-mb", type=int, default=ParseCache.DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="parse cache size cap in MB, counted as the size of the cached inputs")
+    parser.add_argument("--max-items-in-memory", type=int,
+                        help="merge with external sort, holding at most this many items in memory")
+    parser.add_argument("--spill-dir", help="directory for external sort temp files")
+    parser.add_argument("--verify-assets", action="store_true",
+                        help="check local thumb/gallery images exist and write <output>.assets.json")
+    parser.add_argument("--asset-root",
+                        help="directory the image base path maps to (default: image base path next to the output)")
+    parser.add_argument("--drop-dead-assets", action="store_true",
+                        help="with --verify-assets, remove missing or empty gallery images from the output")
+    parser.add_argument("--index", action="store_true",
+                        help="write a search and sort index to <output>.index.json")
+    parser.add_argument("--report", action="store_true", help="write stage timings to <output>.report.json")
+    parser.add_argument("--profile", choices=MergeReport.PROFILE_MODES,
+                        help="record hot spots in process_file (cprofile also writes <output>.prof)")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and rewrite the output whenever input files are added, changed or removed")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds between input scans in --watch mode")
+    parser.add_argument("--debounce", type=float, default=0.5,
+                        help="seconds input changes must settle before --watch applies them")
+    parser.add_argument("--store", help="upsert inputs into this SQLite library instead of a full merge")
+    parser.add_argument("--changes-only", action="store_true",
+                        help="with --store, export only items changed since the last export")
+    return parser
+
+def run_cli(argv):
+    """Headless entry point. Returns a process exit code"""
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    
+    if not args.store and not args.output:
+        parser.error("an output file is required (-o/--output)")
+    if not args.store and not args.inputs:
+        parser.error("no input files given")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.shard_size is not None and args.shard_size < 1:
+        parser.error("--shard-size must be at least 1")
+    if args.compress_level is not None:
+        compression = split_compression_suffix(args.output)[1] if args.output else None
+        low, high = COMPRESS_LEVEL_RANGES.get(compression, (0, 9))
+        if not low <= args.compress_level <= high:
+            parser.error(f"--compress-level must be between {low} and {high}"
+                         + (f" for {compression} output" if compression else ""))
+    if args.watch:
+        # The watcher only rewrites the output; it has no cache, report, index or asset pass
+        unsupported = [flag for flag, value in (
+            ("--store", args.store), ("--max-items-in-memory", args.max_items_in_memory),
+            ("--cache-dir", args.cache_dir), ("--verify-assets", args.verify_assets),
+            ("--drop-dead-assets", args.drop_dead_assets), ("--index", args.index),
+            ("--report", args.report), ("--profile", args.profile)) if value]
+        if unsupported:
+            parser.error(f"--watch cannot be combined with {', '.join(unsupported)}")
+    
+    input_files = collect_input_files(args.inputs, args.recursive, args.patterns or DEFAULT_INPUT_PATTERNS)
+    if args.inputs and not input_files:
+        print("✗ No input files found")
+        return 1
+    
+    try:
+        merger = JSONFileMerger(args.json_backend, args.compress_level)
+    except ImportError as e:
+        parser.error(f"JSON backend {args.json_backend} is not available: {e}")
+    cache_max_bytes = args.cache_max_mb * 1024 * 1024
+    
+    if args.store:
+        try:
+            if input_files and not merger.upsert_files(input_files, args.store, args.image_base_path,
+                                                       args.preserve_metadata, args.workers, args.cache_dir,
+                                                       cache_max_bytes):
+                return 1
+            if args.output and not merger.export_library(args.store, args.output, args.output_format,
+                                                         args.changes_only, args.shard_size,
+                                                         args.shard_by_category):
+                return 1
+        except (OSError, ValueError) as e:
+            print(f"✗ Error updating library {args.store}: {e}")
+            return 1
+        return 0
+    
+    if args.watch:
+        watcher = LibraryWatcher(merger, args.inputs, args.output, args.image_base_path, args.preserve_metadata,
+                                 args.output_format, args.recursive, args.patterns or DEFAULT_INPUT_PATTERNS,
+                                 args.workers, args.poll_interval, args.debounce, args.shard_size,
+                                 args.shard_by_category)
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+        return 0
+    
+    try:
+        success = merger.merge_files(input_files, args.output, args.image_base_path, args.preserve_metadata,
+                                     args.workers, args.cache_dir, cache_max_bytes, args.output_format,
+                                     args.max_items_in_memory, args.spill_dir,
+                                     write_report=args.report, profile=args.profile, shard_size=args.shard_size,
+                                     shard_by_category=args.shard_by_category, write_index=args.index,
+                                     verify_assets=args.verify_assets, asset_root=args.asset_root,
+                                     drop_dead_assets=args.drop_dead_assets)
+    except (OSError, ValueError) as e:
+        print(f"✗ Merge failed: {e}")
+        return 1
+    return 0 if success else 1
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv:
+        return run_cli(argv)
+    
+    import_tkinter()
     root = tk.Tk()
     app = JSONFileMergerGUI(root)
     root.mainloop()
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file